@@ -0,0 +1,104 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from file_utils import atomic_write
+
+# Header: magic, then offset and length of the JSON index that follows the blob
+MAGIC = b'POE2PAK1'
+HEADER = struct.Struct('<8sQQ')
+PACKED_FOLDERS = ('data', 'images')
+
+class AssetPack:
+    """Read-only view of a packed asset file through mmap.
+
+    The pack is a header, one contiguous blob holding every file, and a JSON
+    index of {relative path: [offset, length]}. get() returns zero-copy
+    memoryview slices of the mapping, so opening the pack costs one index
+    read no matter how many assets it holds.
+    """
+
+    def __init__(self, pack_path):
+        self.pack_path = os.path.abspath(pack_path)
+        self._file = open(self.pack_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, index_offset, index_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{pack_path} is not an asset pack")
+        index_bytes = self._view[index_offset:index_offset + index_length]
+        self.index = json.loads(str(index_bytes, 'utf-8'))
+        # Identifies this pack's contents, e.g. for naming an extraction directory
+        self.stamp = hashlib.sha1(index_bytes).hexdigest()[:12]
+        self._children = {}
+        for path in self.index:
+            parts = path.split('/')
+            for depth in range(len(parts)):
+                parent = '/'.join(parts[:depth])
+                self._children.setdefault(parent, set()).add(parts[depth])
+
+    @staticmethod
+    def _key(relative_path):
+        return relative_path.replace('\\', '/').strip('/')
+
+    def __contains__(self, relative_path):
+        return self._key(relative_path) in self.index
+
+    def is_dir(self, relative_path):
+        key = self._key(relative_path)
+        return key not in self.index and key in self._children
+
+    def listdir(self, relative_path):
+        """Names directly inside a packed directory, like os.listdir"""
+        return sorted(self._children.get(self._key(relative_path), ()))
+
+    def get(self, relative_path):
+        """Zero-copy memoryview of a packed file's bytes"""
+        offset, length = self.index[self._key(relative_path)]
+        return self._view[offset:offset + length]
+
+    def extract(self, relative_path, destination):
+        """Write one packed file to destination, for APIs that only take file paths"""
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        # Extracted files are rebuilt from the pack if lost, so no fsync
+        atomic_write(destination, self.get(relative_path), fsync=False)
+
+def build_pack(source_root, output_path, folders=PACKED_FOLDERS):
+    """Pack every file under source_root/<folder> into output_path"""
+    start = time.perf_counter()
+    files = []
+    for folder in folders:
+        for dir_path, dir_names, file_names in os.walk(os.path.join(source_root, folder)):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                full_path = os.path.join(dir_path, file_name)
+                files.append((os.path.relpath(full_path, source_root).replace(os.sep, '/'), full_path))
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    index = {}
+    with open(output_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, 0, 0))
+        for relative_path, full_path in files:
+            with open(full_path, 'rb') as f:
+                data = f.read()
+            index[relative_path] = [out.tell(), len(data)]
+            out.write(data)
+        index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+        index_offset = out.tell()
+        out.write(index_bytes)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, index_offset, len(index_bytes)))
+
+    size = os.path.getsize(output_path)
+    print(f"Packed {len(files)} files into {output_path} ({size / (1024 * 1024):.1f} MB) in {time.perf_counter() - start:.2f}s")
+
+def main():
+    output_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join('dist', 'assets.pak')
+    build_pack(os.path.dirname(os.path.abspath(__file__)), output_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import argparse
+import os
+import random
+import threading
+import time
+
+# Campaign zones in order, as the client logs them
+ZONES = [
+    "Clearfell", "Mud Burrow", "The Grelwood", "The Red Vale", "The Grim Tangle",
+    "Cemetery of the Eternals", "Mausoleum of the Praetor", "Tomb of the Consort",
+    "Hunting Grounds", "Freythorn", "Ogham Farmlands", "Ogham Village",
+    "The Manor Ramparts", "Ogham Manor", "Vastiri Outskirts", "Mawdun Quarry",
+    "Traitor's Passage", "The Halani Gates", "Keth", "The Lost City",
+    "Buried Shrines", "Valley of the Titans", "The Titan Grotto", "The Bone Pits",
+    "Sandswept Marsh", "Jungle Ruins", "The Venom Crypts", "Chimeral Wetlands",
+]
+CLASSES = ["Ranger", "Warrior", "Sorceress", "Monk", "Mercenary", "Witch"]
+CHAT_LINES = [
+    "#{name}: anyone selling a 3-link bow?",
+    "@From {name}: Hi, I would like to buy your Gargantuan Life Flask",
+    "${name}: wts leveling gear, pm me",
+    "#{name}: how do I get to the Titan Grotto",
+]
+NOISE_LINES = [
+    "[DEBUG Client {pid}] Got Instance Details from login server",
+    "[INFO Client {pid}] Connecting to instance server at 10.0.{a}.{b}:6112",
+    "[DEBUG Client {pid}] [SHADER] Delay: ON",
+    "[INFO Client {pid}] [ENGINE] Init",
+    "[DEBUG Client {pid}] Generating level 12 area \"G1_{a}\" with seed {seed}",
+    "[INFO Client {pid}] [RENDER] Texture streaming budget {seed}",
+    "[DEBUG Client {pid}] [SOUND] Loaded bank {a}_{b}.bank",
+]
+
+class LogLineFactory:
+    """Produces Client.txt lines in the game's format, with a campaign-like mix of events.
+
+    zone_rate and level_rate are the fractions of lines that are zone changes
+    and level-ups; chat_rate is the fraction of chat. Everything else is
+    noise. Zones and levels advance in campaign order so replays look like a
+    real playthrough.
+    """
+
+    def __init__(self, seed=0, zone_rate=0.002, level_rate=0.0005, chat_rate=0.02, character="Tester"):
+        self.random = random.Random(seed)
+        self.zone_rate = zone_rate
+        self.level_rate = level_rate
+        self.chat_rate = chat_rate
+        self.character = character
+        self.character_class = self.random.choice(CLASSES)
+        self.zone_index = 0
+        self.level = 1
+        self.clock = time.mktime((2025, 1, 1, 12, 0, 0, 0, 0, -1))
+        self.pid = self.random.randint(1000, 99999)
+
+    def _prefix(self):
+        self.clock += self.random.random() * 0.5
+        stamp = time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(self.clock))
+        return f"{stamp} {int(self.clock * 1000) % 1000000000} {self.random.randrange(16 ** 8):08x}"
+
+    def zone_line(self, zone=None):
+        if zone is None:
+            # Mostly forward through the campaign, sometimes back to town
+            if self.random.random() < 0.8:
+                self.zone_index = (self.zone_index + 1) % len(ZONES)
+            else:
+                self.zone_index = max(0, self.zone_index - 1)
+            zone = ZONES[self.zone_index]
+        return f"{self._prefix()} [DEBUG Client {self.pid}] [SCENE] Set Source [{zone}]"
+
+    def loading_line(self):
+        return f"{self._prefix()} [DEBUG Client {self.pid}] [SCENE] Set Source [(null)]"
+
+    def level_line(self, level=None):
+        if level is None:
+            self.level = min(self.level + 1, 100)
+            level = self.level
+        return f"{self._prefix()} [INFO Client {self.pid}] : {self.character} ({self.character_class}) is now level {level}"
+
+    def chat_line(self):
+        text = self.random.choice(CHAT_LINES).format(name=f"Player{self.random.randint(1, 9999)}")
+        return f"{self._prefix()} [INFO Client {self.pid}] {text}"
+
+    def noise_line(self):
+        text = self.random.choice(NOISE_LINES).format(
+            pid=self.pid, a=self.random.randint(0, 255), b=self.random.randint(0, 255),
+            seed=self.random.randint(0, 2 ** 31))
+        return f"{self._prefix()} {text}"
+
+    def next_line(self):
+        r = self.random.random()
+        if r < self.zone_rate:
+            return self.zone_line()
+        r -= self.zone_rate
+        if r < self.level_rate:
+            return self.level_line()
+        r -= self.level_rate
+        if r < self.chat_rate:
+            return self.chat_line()
+        if r < self.chat_rate + 0.001:
+            return self.loading_line()
+        return self.noise_line()
+
+def parse_size(text):
+    """'512KB', '16MB', '2GB' or a plain byte count"""
+    text = text.strip().upper()
+    for suffix, factor in (("GB", 1024 ** 3), ("MB", 1024 ** 2), ("KB", 1024)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * factor)
+    return int(text)
+
+def generate_log(path, size_bytes, seed=0, **factory_options):
+    """Write a synthetic Client.txt of about size_bytes; returns the LogLineFactory used"""
+    factory = LogLineFactory(seed=seed, **factory_options)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        while written < size_bytes:
+            batch = "\n".join(factory.next_line() for _ in range(1000)) + "\n"
+            f.write(batch)
+            written += len(batch.encode('utf-8'))
+    return factory
+
+def ensure_log(cache_dir, size_bytes, seed=0):
+    """Path to a generated log of size_bytes, reusing one generated earlier"""
+    path = os.path.join(cache_dir, f"client_{size_bytes}_{seed}.txt")
+    if not os.path.exists(path):
+        generate_log(path, size_bytes, seed=seed)
+    return path
+
+class LiveLogWriter:
+    """Appends lines to a log on a background thread, like the game client does.
+
+    Noise is written at lines_per_second; write_line() appends a specific
+    line immediately and returns the perf_counter time it was flushed, for
+    latency measurements.
+    """
+
+    def __init__(self, path, lines_per_second=50, seed=1):
+        self.path = path
+        self.lines_per_second = lines_per_second
+        self.factory = LogLineFactory(seed=seed)
+        self._file = open(path, 'a', encoding='utf-8', newline='\n')
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def write_line(self, line):
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            return time.perf_counter()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        interval = 1.0 / self.lines_per_second if self.lines_per_second > 0 else None
+        while interval and not self._stop.wait(interval):
+            self.write_line(self.factory.noise_line())
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._file.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic PoE2 Client.txt")
+    parser.add_argument("output", help="file to write")
+    parser.add_argument("--size", default="64MB", help="approximate size, e.g. 512KB, 64MB, 2GB")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", type=float, default=0,
+                        help="after generating, keep appending this many lines per second (Ctrl+C to stop)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    size = parse_size(args.size)
+    generate_log(args.output, size, seed=args.seed)
+    print(f"Wrote {os.path.getsize(args.output) / (1024 * 1024):.1f} MB to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+
+    if args.live > 0:
+        writer = LiveLogWriter(args.output, lines_per_second=args.live, seed=args.seed + 1)
+        writer.start()
+        print(f"Appending {args.live:g} lines/sec - Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(10 + writer.factory.random.random() * 20)
+                writer.write_line(writer.factory.zone_line())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            writer.stop()
+
+if __name__ == "__main__":
+    main()
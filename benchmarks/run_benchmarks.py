@@ -0,0 +1,220 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from benchmarks.generate_log import LiveLogWriter, LogLineFactory, ensure_log, parse_size
+from log_parser import LogParser
+from log_watcher import PollingWatcher, create_watcher
+from recommendation_engine import get_engine
+from tracker_engine import TrackerEngine, recommend
+
+DEFAULT_SIZES = "1MB,16MB,128MB"
+
+def summarize(samples, scale=1.0):
+    """min/median/p95/max of samples, multiplied by scale"""
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "min": ordered[0] * scale,
+        "median": statistics.median(ordered) * scale,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * scale,
+        "max": ordered[-1] * scale
+    }
+
+def bench_parser(log_path):
+    """Parser throughput over every line of a log"""
+    with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = f.read().split('\n')
+    parser = LogParser()
+    start = time.perf_counter()
+    events = parser.parse(lines)
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(log_path)
+    return {
+        "bytes": size,
+        "lines": len(lines),
+        "events": len(events),
+        "seconds": seconds,
+        "lines_per_second": len(lines) / seconds,
+        "mb_per_second": size / (1024 * 1024) / seconds
+    }
+
+def bench_tick_cost(log_path, ticks=200, lines_per_tick=20):
+    """Cost of one monitor tick (poll after new lines arrive) on a log of this size"""
+    original_size = os.path.getsize(log_path)
+    factory = LogLineFactory(seed=7)
+    engine = TrackerEngine(log_path)
+    engine.sync()
+    samples = []
+    try:
+        with open(log_path, 'a', encoding='utf-8', newline='\n') as f:
+            for _ in range(ticks):
+                f.write("\n".join(factory.next_line() for _ in range(lines_per_tick)) + "\n")
+                f.flush()
+                start = time.perf_counter()
+                engine.poll()
+                samples.append(time.perf_counter() - start)
+    finally:
+        # Leave the cached log as it was
+        os.truncate(log_path, original_size)
+    result = {"bytes": original_size, "lines_per_tick": lines_per_tick}
+    result["tick_us"] = summarize(samples, 1e6)
+    return result
+
+def bench_zone_latency(log_path, watcher_name, changes=20):
+    """Time from the game writing a zone line to the engine reporting the zone change"""
+    work_dir = tempfile.mkdtemp(prefix="poe2_latency_")
+    live_path = os.path.join(work_dir, "Client.txt")
+    shutil.copyfile(log_path, live_path)
+    engine = TrackerEngine(live_path)
+    engine.sync()
+
+    detected = threading.Event()
+    detected_at = [0.0]
+    def on_change(engine, changed, event):
+        if "zone" in changed:
+            detected_at[0] = time.perf_counter()
+            detected.set()
+    engine.add_listener(on_change)
+
+    watcher = PollingWatcher(live_path) if watcher_name == "polling" else create_watcher(live_path)
+    running = [True]
+    thread = threading.Thread(target=engine.follow, args=(lambda: running[0],),
+                              kwargs={"watcher": watcher}, daemon=True)
+    thread.start()
+    writer = LiveLogWriter(live_path, lines_per_second=50, seed=3)
+    writer.start()
+    samples = []
+    try:
+        time.sleep(0.2)
+        for i in range(changes):
+            detected.clear()
+            written_at = writer.write_line(writer.factory.zone_line(f"Latency Zone {i}"))
+            if detected.wait(timeout=5):
+                samples.append(detected_at[0] - written_at)
+            # Let the polling watcher back off a little, like between real zone changes
+            time.sleep(0.3)
+    finally:
+        writer.stop()
+        running[0] = False
+        engine.wake()
+        thread.join(timeout=5)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "watcher": type(watcher).__name__,
+        "missed": changes - len(samples),
+        "latency_ms": summarize(samples, 1e3) if samples else None
+    }
+
+def bench_startup_detection(log_path, repeats=5):
+    """Time to find the current zone/level when monitoring starts, cold and from a checkpoint"""
+    scan_samples = []
+    resume_samples = []
+    checkpoint = None
+    for _ in range(repeats):
+        engine = TrackerEngine(log_path)
+        start = time.perf_counter()
+        engine.sync()
+        scan_samples.append(time.perf_counter() - start)
+        checkpoint = engine.checkpoint()
+    for _ in range(repeats):
+        engine = TrackerEngine(log_path)
+        start = time.perf_counter()
+        engine.sync(checkpoint)
+        resume_samples.append(time.perf_counter() - start)
+    return {
+        "bytes": os.path.getsize(log_path),
+        "reverse_scan_ms": summarize(scan_samples, 1e3),
+        "checkpoint_resume_ms": summarize(resume_samples, 1e3)
+    }
+
+def bench_lookups(iterations=200):
+    """Flask/weapon recommendation lookups for every level of every category"""
+    engine = get_engine()
+    results = {}
+    levels = range(1, 101)
+    for category in engine.categories():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for level in levels:
+                engine.best_for_level(category, level)
+        seconds = time.perf_counter() - start
+        results[category] = {"ns_per_lookup": seconds / (iterations * len(levels)) * 1e9}
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for level in levels:
+            recommend(level, "Bow")
+    seconds = time.perf_counter() - start
+    results["recommend(level, Bow)"] = {"ns_per_lookup": seconds / (iterations * len(levels)) * 1e9}
+    return results
+
+def run(sizes, cache_dir, only=None):
+    def wanted(name):
+        return not only or name in only
+
+    results = {}
+    log_paths = {}
+    for size in sizes:
+        start = time.perf_counter()
+        log_paths[size] = ensure_log(cache_dir, size)
+        print(f"Log of {size / (1024 * 1024):.0f} MB ready in {time.perf_counter() - start:.1f}s")
+    smallest = log_paths[min(sizes)]
+    largest = log_paths[max(sizes)]
+
+    if wanted("parser"):
+        print("Benchmarking parser...")
+        results["parser"] = bench_parser(largest)
+    if wanted("tick_cost"):
+        print("Benchmarking tick cost by file size...")
+        results["tick_cost"] = [bench_tick_cost(log_paths[size]) for size in sizes]
+    if wanted("zone_latency"):
+        print("Benchmarking zone change latency...")
+        results["zone_latency"] = [bench_zone_latency(smallest, name) for name in ("default", "polling")]
+    if wanted("startup_detection"):
+        print("Benchmarking startup detection...")
+        results["startup_detection"] = [bench_startup_detection(log_paths[size]) for size in sizes]
+    if wanted("lookups"):
+        print("Benchmarking recommendation lookups...")
+        results["lookups"] = bench_lookups()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log monitoring and recommendations")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"log sizes to test (default {DEFAULT_SIZES})")
+    parser.add_argument("--cache-dir", default=os.path.join(tempfile.gettempdir(), "poe2_benchmark_logs"),
+                        help="where generated logs are kept between runs")
+    parser.add_argument("--only", nargs="*",
+                        help="run a subset: parser tick_cost zone_latency startup_detection lookups")
+    parser.add_argument("--output", help="write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    sizes = sorted(parse_size(size) for size in args.sizes.split(","))
+    # Progress goes to stderr so stdout is only the JSON report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = run(sizes, args.cache_dir, args.only)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes
+        },
+        "results": results
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
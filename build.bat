@@ -39,8 +39,6 @@ python -m PyInstaller ^
     --onefile ^
     --windowed ^
     --name "poe_campaign_layouts" ^
-    --add-data "data;data" ^
-    --add-data "images;images" ^
     --exclude-module numpy ^
     --exclude-module matplotlib ^
     --exclude-module scipy ^
@@ -55,6 +53,17 @@ if %ERRORLEVEL% neq 0 (
     exit /b 1
 )
 
+REM Pack data/ and images/ into one memory-mapped file shipped next to the exe,
+REM so the onefile build doesn't extract every map to a temp dir on each launch
+echo.
+echo Building asset pack...
+python asset_pack.py "dist\assets.pak"
+if %ERRORLEVEL% neq 0 (
+    echo Failed to build asset pack
+    pause
+    exit /b 1
+)
+
 echo.
 echo =====================================
 echo  Build Complete!
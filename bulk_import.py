@@ -0,0 +1,127 @@
+import gzip
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from log_parser import BYTE_MARKERS, parse_line
+
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+def is_gzip(path):
+    with open(path, 'rb') as f:
+        return f.read(2) == b'\x1f\x8b'
+
+def chunk_ranges(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """(start, end) byte ranges of about chunk_bytes covering the file, each ending after a newline"""
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                # Extend to the end of the line the boundary fell in
+                f.seek(end)
+                while True:
+                    block = f.read(64 * 1024)
+                    newline = block.find(b'\n')
+                    if newline >= 0:
+                        end += newline + 1
+                        break
+                    if not block:
+                        break
+                    end += len(block)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def parse_block(data):
+    """Events in a block of whole log lines, in log order; returns (events, line count)"""
+    # Only lines containing a marker are decoded and matched
+    line_starts = set()
+    for marker in BYTE_MARKERS:
+        position = data.find(marker)
+        while position >= 0:
+            line_starts.add(data.rfind(b'\n', 0, position) + 1)
+            position = data.find(marker, position + len(marker))
+    events = []
+    for start in sorted(line_starts):
+        end = data.find(b'\n', start)
+        line = data[start:end if end >= 0 else len(data)].decode('utf-8', errors='replace')
+        event = parse_line(line)
+        if event is not None:
+            events.append(event)
+    return events, data.count(b'\n')
+
+def parse_file_range(path, start, end):
+    """Worker: parse one newline-aligned range of an uncompressed log"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    events, lines = parse_block(data)
+    return events, lines, len(data)
+
+def parse_bytes(data):
+    """Worker: parse one newline-aligned block of decompressed log text"""
+    events, lines = parse_block(data)
+    return events, lines, len(data)
+
+def gzip_blocks(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Decompress a gzip log as a stream of newline-aligned blocks (nothing is written to disk)"""
+    carry = b""
+    with gzip.open(path, 'rb') as f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                break
+            data = carry + data
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                carry = data
+                continue
+            carry = data[cut:]
+            yield data[:cut]
+    if carry:
+        yield carry
+
+def bulk_import(path, on_events, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Parse a whole (optionally gzip-compressed) log across a process pool.
+
+    Chunks are parsed in parallel but on_events(events) is called once per
+    chunk in file order, so the caller sees the same event sequence a
+    single pass would produce. At most two chunks per worker are in flight,
+    which bounds memory for multi-GB files. Returns throughput statistics.
+    """
+    workers = workers or os.cpu_count() or 1
+    compressed = is_gzip(path)
+    start = time.perf_counter()
+    stats = {"bytes": 0, "lines": 0, "events": 0, "chunks": 0, "workers": workers, "gzip": compressed,
+             "file_bytes": os.path.getsize(path)}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if compressed:
+            # Decompression is a single stream; only the parsing fans out
+            jobs = ((parse_bytes, (block,)) for block in gzip_blocks(path, chunk_bytes))
+        else:
+            # Workers read their own ranges, so no log text crosses process boundaries
+            jobs = ((parse_file_range, (path, range_start, range_end))
+                    for range_start, range_end in chunk_ranges(path, chunk_bytes))
+        pending = deque()
+
+        def merge_oldest():
+            events, lines, size = pending.popleft().result()
+            stats["bytes"] += size
+            stats["lines"] += lines
+            stats["events"] += len(events)
+            stats["chunks"] += 1
+            on_events(events)
+
+        for function, args in jobs:
+            pending.append(pool.submit(function, *args))
+            if len(pending) >= workers * 2:
+                merge_oldest()
+        while pending:
+            merge_oldest()
+    seconds = time.perf_counter() - start
+    stats["seconds"] = seconds
+    stats["mb_per_second"] = stats["bytes"] / (1024 * 1024) / seconds if seconds > 0 else 0.0
+    return stats
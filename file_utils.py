@@ -0,0 +1,25 @@
+import os
+import tempfile
+
+def atomic_write(path, data, fsync=True):
+    """Write text or bytes to path via a temp file and rename, so the file is never half-written.
+
+    Every call gets its own temp file, so two threads writing the same path
+    can't truncate each other's copy - the last rename wins. Pass fsync=False
+    for files that can simply be rebuilt if a crash loses them.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                     prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w' if isinstance(data, str) else 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
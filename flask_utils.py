@@ -1,36 +1,21 @@
-import json
 import os
 from PIL import Image
-from path_utils import get_data_file_path, get_image_file_path
+from path_utils import get_data_file_path, get_image_file_path, read_resource_json
+from recommendation_engine import get_engine
 
 def load_flask_data():
     """Load flask data from JSON file."""
     flask_file = get_data_file_path('flasks.json')
     try:
-        with open(flask_file, 'r') as f:
-            return json.load(f)
+        return read_resource_json(os.path.join('data', 'flasks.json'))
     except Exception as e:
         print(f"Error loading flask data from {flask_file}: {e}")
         return {"lifeFlasks": [], "uniqueFlasks": []}
 
 def get_best_flask_for_level(player_level):
     """Get the best life flask available for the given player level."""
-    if player_level is None:
-        return None
-    
-    flask_data = load_flask_data()
-    
-    # Combine regular life flasks and unique life flasks
-    all_flasks = flask_data.get("lifeFlasks", []) + [f for f in flask_data.get("uniqueFlasks", []) if "life" in f.get("type", "").lower()]
-    
-    # Find the best flask that the player can use
-    available_flasks = [f for f in all_flasks if f["requiredLevel"] <= player_level]
-    
-    if not available_flasks:
-        return None
-    
-    # Return the flask with the highest required level (best flask available)
-    return max(available_flasks, key=lambda x: x["requiredLevel"])
+    # Life flasks (regular and unique) are combined in data/item_categories.json
+    return get_engine().best_for_level("Life Flask", player_level)
 
 def get_flask_image(flask_info):
     """Get PIL Image for the given flask from local file."""
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from path_utils import open_resource_file, resource_file_version
+from file_utils import atomic_write
+
+# Don't build levels smaller than this on the longer side - the display minimums are 200x150
+MIN_LEVEL_SIZE = 256
+INDEX_FILE = "index.json"
+
+def hash_file(path):
+    """SHA-1 of a file's (or packed resource's) contents, streamed"""
+    digest = hashlib.sha1()
+    with open_resource_file(path) as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ImagePyramid:
+    """Downscaled copies of each map image, cached on disk by source hash.
+
+    Each source image gets successively halved levels down to
+    MIN_LEVEL_SIZE. The display path asks for the smallest level that still
+    covers the size it will be drawn at, so decode time, texture upload and
+    texture memory shrink with the window instead of always paying for the
+    full-resolution source.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        # Source hashes whose level files are known to be on disk - checked once here and
+        # kept up to date by build_levels, so select() never touches the filesystem
+        self._ready = {source_hash for source_hash, levels in self._index["levels"].items()
+                       if self._levels_exist(levels)}
+        self._thread = None
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.cache_dir, INDEX_FILE), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"sources": {}, "levels": {}}
+        except Exception as e:
+            print(f"Error loading map cache index: {e}")
+            return {"sources": {}, "levels": {}}
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        with self._lock:
+            data = json.dumps(self._index, indent=2)
+        atomic_write(index_path, data)
+
+    def _source_hash(self, source_path):
+        """Hash for source_path, reusing the cached one while size/version are unchanged"""
+        size, version = resource_file_version(source_path)
+        with self._lock:
+            known = self._index["sources"].get(source_path)
+        if known and known["size"] == size and known.get("version") == version:
+            return known["hash"]
+        source_hash = hash_file(source_path)
+        with self._lock:
+            self._index["sources"][source_path] = {"size": size, "version": version, "hash": source_hash}
+        return source_hash
+
+    def _levels_exist(self, levels):
+        return all(os.path.exists(os.path.join(self.cache_dir, level["file"])) for level in levels)
+
+    def build_levels(self, source_path):
+        """Make sure the downscaled levels for source_path exist on disk.
+
+        Packed sources are decoded straight from the pack - nothing is extracted.
+        """
+        source_hash = self._source_hash(source_path)
+        with self._lock:
+            if source_hash in self._ready:
+                return False
+
+        from PIL import Image
+        levels = []
+        level_dir = os.path.join(self.cache_dir, source_hash)
+        os.makedirs(level_dir, exist_ok=True)
+        with open_resource_file(source_path) as source, Image.open(source) as image:
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+            while max(image.width, image.height) // 2 >= MIN_LEVEL_SIZE:
+                image = image.reduce(2)
+                file_name = os.path.join(source_hash, f"{image.width}x{image.height}.png")
+                # Light compression - these files are about fast decode, not disk space
+                image.save(os.path.join(self.cache_dir, file_name), compress_level=1)
+                levels.append({"file": file_name, "width": image.width, "height": image.height})
+
+        with self._lock:
+            self._index["levels"][source_hash] = levels
+            self._ready.add(source_hash)
+        return True
+
+    def build_all(self, image_paths):
+        """Build levels for every source image, saving the index once at the end"""
+        start = time.perf_counter()
+        built = 0
+        # Forget sources that no longer exist (e.g. an old PyInstaller temp dir)
+        wanted = set(image_paths)
+        with self._lock:
+            self._index["sources"] = {path: info for path, info in self._index["sources"].items() if path in wanted}
+        for path in image_paths:
+            try:
+                if self.build_levels(path):
+                    built += 1
+            except ImportError:
+                print("Pillow not available - map images will be shown at full resolution")
+                return
+            except Exception as e:
+                print(f"Error building map levels for {path}: {e}")
+        try:
+            self._save_index()
+        except Exception as e:
+            print(f"Error saving map cache index: {e}")
+        print(f"Map image cache ready: built {built} of {len(image_paths)} in {time.perf_counter() - start:.1f}s")
+
+    def build_all_in_background(self, image_paths):
+        self._thread = threading.Thread(target=self.build_all, args=(list(image_paths),), daemon=True)
+        self._thread.start()
+
+    def select(self, image, display_width, display_height):
+        """Pick the smallest cached level that covers the display size.
+
+        image is a manifest entry ({'path', 'width', 'height'}); returns an
+        entry of the same shape, falling back to the source image itself.
+        """
+        source_path = image['path']
+        with self._lock:
+            known = self._index["sources"].get(source_path)
+            ready = known is not None and known["hash"] in self._ready
+            levels = self._index["levels"].get(known["hash"]) if ready else None
+        if not levels:
+            return image
+        # Levels are stored largest first, so walk from the smallest up
+        for level in reversed(levels):
+            if level["width"] >= display_width and level["height"] >= display_height:
+                return {'path': os.path.join(self.cache_dir, level["file"]),
+                        'width': level["width"], 'height': level["height"]}
+        return image
@@ -0,0 +1,84 @@
+import re
+import time
+from collections import namedtuple
+
+# Typed events produced from Client.txt lines
+ZoneEntered = namedtuple('ZoneEntered', ['zone', 'timestamp'])
+LevelUp = namedtuple('LevelUp', ['character', 'character_class', 'level', 'timestamp'])
+# The game writes this line each time it starts, so whoever plays next may be a different character
+LogOpened = namedtuple('LogOpened', ['timestamp'])
+
+# Zone names the client logs while loading that aren't real zones
+IGNORED_ZONES = ("(null)", "(unknown)")
+
+# (substring prefilter, compiled pattern, event builder) - the cheap `in` check
+# rejects almost every line before any regex runs
+_ZONE_MARKER = "[SCENE] Set Source ["
+_ZONE_REGEX = re.compile(r'\[SCENE\] Set Source \[([^\]]+)\]')
+_LEVEL_MARKER = " is now level "
+_LEVEL_REGEX = re.compile(r":\s*([^:()]+?)\s*\(([^)]*)\) is now level (\d+)")
+_OPENED_MARKER = "***** LOG FILE OPENING *****"
+_OPENED_REGEX = re.compile(re.escape(_OPENED_MARKER))
+
+def _line_timestamp(line):
+    """Return the 'YYYY/MM/DD HH:MM:SS' prefix of a log line, if present"""
+    if len(line) >= 19 and line[4] == '/' and line[13] == ':':
+        return line[:19]
+    return None
+
+def _zone_event(match, line):
+    zone = match.group(1)
+    if zone in IGNORED_ZONES:
+        return None
+    return ZoneEntered(zone, _line_timestamp(line))
+
+def _level_event(match, line):
+    return LevelUp(match.group(1), match.group(2), int(match.group(3)), _line_timestamp(line))
+
+def _opened_event(match, line):
+    return LogOpened(_line_timestamp(line))
+
+EVENT_MATCHERS = [
+    (_ZONE_MARKER, _ZONE_REGEX, _zone_event),
+    (_LEVEL_MARKER, _LEVEL_REGEX, _level_event),
+    (_OPENED_MARKER, _OPENED_REGEX, _opened_event),
+]
+
+# Encoded markers for prefiltering raw bytes before decoding them
+BYTE_MARKERS = tuple(marker.encode('utf-8') for marker, _, _ in EVENT_MATCHERS)
+
+def parse_line(line):
+    """Turn a single log line into an event, or None if it isn't interesting"""
+    for marker, regex, build in EVENT_MATCHERS:
+        if marker in line:
+            match = regex.search(line)
+            if match:
+                return build(match, line)
+    return None
+
+class LogParser:
+    """Single-pass log line parser that keeps throughput statistics"""
+
+    def __init__(self):
+        self.lines_parsed = 0
+        self.events_emitted = 0
+        self.parse_seconds = 0.0
+
+    def parse(self, lines):
+        """Return the list of events found in lines, in log order"""
+        start = time.perf_counter()
+        events = []
+        for line in lines:
+            event = parse_line(line)
+            if event is not None:
+                events.append(event)
+        self.parse_seconds += time.perf_counter() - start
+        self.lines_parsed += len(lines)
+        self.events_emitted += len(events)
+        return events
+
+    @property
+    def lines_per_second(self):
+        if self.parse_seconds <= 0:
+            return 0.0
+        return self.lines_parsed / self.parse_seconds
@@ -0,0 +1,154 @@
+import codecs
+import hashlib
+import json
+import os
+from log_parser import BYTE_MARKERS, ZoneEntered, LevelUp, parse_line
+
+class LogTailReader:
+    """Incrementally read lines appended to a log file.
+
+    Keeps the byte offset of the last read so each call only touches the
+    bytes written since then. Incomplete trailing lines and multi-byte
+    UTF-8 sequences split across reads are held back until the rest arrives.
+    """
+
+    def __init__(self, log_path, offset=0):
+        self.log_path = log_path
+        self.offset = offset
+        self._partial = ""
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+
+    def seek(self, offset):
+        """Move the read position, discarding any buffered partial line"""
+        self.offset = offset
+        self._partial = ""
+        self._decoder.reset()
+
+    def seek_to_end(self):
+        """Skip everything currently in the file"""
+        self.seek(os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0)
+
+    @property
+    def line_offset(self):
+        """Byte offset just past the last complete line returned"""
+        pending, _ = self._decoder.getstate()
+        return self.offset - len(pending) - len(self._partial.encode('utf-8'))
+
+    def read_new_lines(self, max_bytes=None):
+        """Return complete lines appended since the last call"""
+        with open(self.log_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read() if max_bytes is None else f.read(max_bytes)
+        if not data:
+            return []
+        self.offset += len(data)
+
+        text = self._partial + self._decoder.decode(data)
+        lines = text.split('\n')
+        # The last element is whatever follows the final newline - keep it for next time
+        self._partial = lines.pop()
+        return lines
+
+def scan_latest_events(log_path, end_offset=None, block_size=64 * 1024):
+    """Scan a log backwards from EOF for the latest zone entry and level-up.
+
+    Reads fixed-size blocks from the end of the file and stops as soon as
+    both events are found, so the cost depends on how far back they are
+    rather than on the total size of the log.
+    Returns a (ZoneEntered or None, LevelUp or None) tuple.
+    """
+    zone_event = None
+    level_event = None
+    with open(log_path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END) if end_offset is None else end_offset
+        # Bytes of the line that straddles the boundary with the previous block
+        carry = b""
+        while position > 0 and (zone_event is None or level_event is None):
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size) + carry
+            if position > 0:
+                # The first line may continue in the previous block - hold it back
+                newline = chunk.find(b'\n')
+                if newline < 0:
+                    carry = chunk
+                    continue
+                carry = chunk[:newline]
+                chunk = chunk[newline + 1:]
+            # Most blocks contain no events at all - skip splitting and decoding them
+            if not any(marker in chunk for marker in BYTE_MARKERS):
+                continue
+            for raw_line in reversed(chunk.split(b'\n')):
+                event = parse_line(raw_line.decode('utf-8', errors='ignore'))
+                if event is None:
+                    continue
+                if zone_event is None and isinstance(event, ZoneEntered):
+                    zone_event = event
+                elif level_event is None and isinstance(event, LevelUp):
+                    level_event = event
+                if zone_event is not None and level_event is not None:
+                    break
+    return zone_event, level_event
+
+# Checkpoint lives next to settings.json so restarts can resume where we left off
+CHECKPOINT_FILE = 'log_checkpoint.json'
+_IDENTITY_HEAD_BYTES = 256
+
+def get_file_identity(log_path):
+    """Identify a log file by device/inode plus a hash of its first bytes.
+
+    The head hash catches a file that was deleted and recreated at the same
+    path, which can reuse the inode (and on Windows st_ino may be 0).
+    """
+    st = os.stat(log_path)
+    with open(log_path, 'rb') as f:
+        head = f.read(_IDENTITY_HEAD_BYTES)
+    return {
+        "device": st.st_dev,
+        "inode": st.st_ino,
+        "head_length": len(head),
+        "head_hash": hashlib.sha1(head).hexdigest()
+    }
+
+def is_same_file(log_path, identity):
+    """Check whether log_path is still the file described by identity"""
+    if not identity:
+        return False
+    try:
+        st = os.stat(log_path)
+        if st.st_dev != identity.get("device") or st.st_ino != identity.get("inode"):
+            return False
+        with open(log_path, 'rb') as f:
+            # Compare the same number of bytes we hashed, in case the file was small then
+            head = f.read(identity.get("head_length", 0))
+        return hashlib.sha1(head).hexdigest() == identity.get("head_hash")
+    except OSError:
+        return False
+
+def load_checkpoints(checkpoint_path=CHECKPOINT_FILE):
+    """Saved log checkpoints as {log path: checkpoint} (empty if there aren't any)"""
+    try:
+        with open(checkpoint_path, 'r') as f:
+            checkpoints = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Error loading log checkpoint: {e}")
+        return {}
+    if not isinstance(checkpoints, dict):
+        return {}
+    if "log_path" in checkpoints:
+        # Written when only the active log had a checkpoint
+        return {checkpoints["log_path"]: checkpoints}
+    return checkpoints
+
+def checkpoint_is_valid(checkpoint, log_path):
+    """A checkpoint can be resumed if it's for this file and the file hasn't shrunk"""
+    if not checkpoint or checkpoint.get("log_path") != log_path:
+        return False
+    try:
+        size = os.path.getsize(log_path)
+    except OSError:
+        return False
+    return checkpoint.get("offset", 0) <= size and is_same_file(log_path, checkpoint.get("identity"))
@@ -0,0 +1,218 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+def _as_paths(log_paths):
+    """Watchers take one path or a list of paths"""
+    if log_paths is None:
+        return []
+    return [log_paths] if isinstance(log_paths, (str, bytes, os.PathLike)) else list(log_paths)
+
+class PollingWatcher:
+    """Watch log files by polling their size/mtime with adaptive backoff.
+
+    Polls quickly while a file keeps changing and backs off towards
+    max_interval once everything goes quiet (e.g. the game is closed).
+    Each poll is one stat() per watched file.
+    """
+
+    def __init__(self, log_paths, min_interval=0.05, max_interval=2.0, backoff=1.5):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self._lock = threading.Lock()
+        self._last_stat = {}
+        for path in _as_paths(log_paths):
+            self.add(path)
+        self._wake_event = threading.Event()
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def add(self, log_path):
+        with self._lock:
+            self._last_stat[log_path] = self._stat(log_path)
+
+    def remove(self, log_path):
+        with self._lock:
+            self._last_stat.pop(log_path, None)
+
+    def _changed(self):
+        with self._lock:
+            paths = list(self._last_stat)
+        changed = set()
+        for path in paths:
+            current = self._stat(path)
+            with self._lock:
+                if path in self._last_stat and current != self._last_stat[path]:
+                    self._last_stat[path] = current
+                    changed.add(path)
+        return changed
+
+    def wait_changes(self, timeout=None):
+        """Block until files change; returns the changed paths (empty on timeout or wake())"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._changed()
+            if changed:
+                self.interval = self.min_interval
+                return changed
+
+            sleep_for = self.interval
+            if deadline is not None:
+                sleep_for = min(sleep_for, deadline - time.monotonic())
+                if sleep_for <= 0:
+                    return set()
+            if self._wake_event.wait(sleep_for):
+                self._wake_event.clear()
+                return set()
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def wait(self, timeout=None):
+        """Block until a file changes; returns False on timeout or wake()"""
+        return bool(self.wait_changes(timeout))
+
+    def wake(self):
+        """Interrupt a blocked wait() from another thread"""
+        self._wake_event.set()
+
+    def close(self):
+        pass
+
+class InotifyWatcher:
+    """Block on Linux inotify events for the log files' directories.
+
+    Watching directories rather than files also reports a log being
+    deleted, recreated or renamed into place. All logs share one inotify
+    descriptor and one watch per directory, so a blocked wait costs nothing
+    however many logs are watched and only the files that changed are
+    reported.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    _EVENT_HEADER = struct.Struct('iIII')
+    _MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, log_paths):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._lock = threading.Lock()
+        # directory -> watch descriptor, and watch descriptor -> {file name: log path}
+        self._watches = {}
+        self._files = {}
+        try:
+            for path in _as_paths(log_paths):
+                self.add(path)
+        except OSError:
+            os.close(self._fd)
+            raise
+        # Self-pipe so wake() can interrupt select() from another thread
+        self._wake_read, self._wake_write = os.pipe()
+        self._closed = False
+
+    def add(self, log_path):
+        directory = os.path.dirname(os.path.abspath(log_path))
+        with self._lock:
+            wd = self._watches.get(directory)
+            if wd is None:
+                wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK)
+                if wd < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+                self._watches[directory] = wd
+            self._files.setdefault(wd, {})[os.fsencode(os.path.basename(log_path))] = log_path
+
+    def remove(self, log_path):
+        directory = os.path.dirname(os.path.abspath(log_path))
+        with self._lock:
+            wd = self._watches.get(directory)
+            if wd is None:
+                return
+            names = self._files.get(wd, {})
+            names.pop(os.fsencode(os.path.basename(log_path)), None)
+            if not names:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[directory]
+                self._files.pop(wd, None)
+
+    def _drain_events(self):
+        """Read pending inotify events; returns the watched log paths they concern"""
+        changed = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            with self._lock:
+                while offset < len(buffer):
+                    wd, _, _, name_len = self._EVENT_HEADER.unpack_from(buffer, offset)
+                    offset += self._EVENT_HEADER.size
+                    name = buffer[offset:offset + name_len].rstrip(b'\0')
+                    offset += name_len
+                    path = self._files.get(wd, {}).get(name)
+                    if path is not None:
+                        changed.add(path)
+
+    def wait_changes(self, timeout=None):
+        """Block until files change; returns the changed paths (empty on timeout or wake())"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd, self._wake_read], [], [], remaining)
+            if not readable:
+                return set()
+            if self._wake_read in readable:
+                os.read(self._wake_read, 64)
+                return set()
+            changed = self._drain_events()
+            if changed:
+                return changed
+
+    def wait(self, timeout=None):
+        """Block until a file changes; returns False on timeout or wake()"""
+        return bool(self.wait_changes(timeout))
+
+    def wake(self):
+        """Interrupt a blocked wait() from another thread"""
+        if self._closed:
+            return
+        try:
+            os.write(self._wake_write, b'x')
+        except OSError:
+            pass
+
+    def close(self):
+        self._closed = True
+        for fd in (self._fd, self._wake_read, self._wake_write):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+def create_watcher(log_paths):
+    """Return the best available watcher for one log path or a list of them on this platform"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(log_paths)
+        except (OSError, AttributeError) as e:
+            print(f"inotify unavailable ({e}) - falling back to polling")
+    return PollingWatcher(log_paths)
@@ -0,0 +1,81 @@
+import threading
+from texture_cache import BYTES_PER_PIXEL
+
+def image_bytes(image):
+    """Texture memory a manifest image will take, estimated from its size so nothing is decoded"""
+    return (image['width'] or 0) * (image['height'] or 0) * BYTES_PER_PIXEL
+
+class MapPrefetcher:
+    """Decode the maps for upcoming zones on a background thread.
+
+    On each zone change the previous request is abandoned and the next
+    `depth` zones in campaign order (plus the previous zone, for
+    backtracking) are loaded into the texture cache, up to max_bytes of
+    texture memory per request. select_level(image, num_maps) maps a
+    manifest image to the file that will actually be displayed. Decoding
+    happens on the worker; texture uploads go through dispatch(key,
+    callback) so they run on the UI thread.
+    """
+
+    def __init__(self, texture_cache, zone_manifest, select_level, dispatch=None, depth=2, max_bytes=256 * 1024 * 1024):
+        self.texture_cache = texture_cache
+        self.dispatch = dispatch
+        self.zone_manifest = zone_manifest
+        self.select_level = select_level
+        self.depth = depth
+        self.max_bytes = max_bytes
+        self._pending = None
+        self._generation = 0
+        self._running = True
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def request(self, zone_name):
+        """Queue the neighbours of zone_name for prefetch; returns immediately"""
+        if self.depth <= 0:
+            return
+        # The new zone's maps are the ones going on screen - pin them before sizing the budget,
+        # or the previous zone's maps would still be counted
+        entry = self.zone_manifest.get(zone_name)
+        on_screen = [self.select_level(image, len(entry['images'])) for image in entry['images']] if entry else []
+        self.texture_cache.pin([image['path'] for image in on_screen])
+        # Never prefetch so much that it would evict other prefetched maps or the ones on screen
+        reserved = max(self.texture_cache.pinned_bytes(), sum(image_bytes(image) for image in on_screen))
+        budget = min(self.max_bytes, self.texture_cache.budget_bytes - reserved)
+        images = [self.select_level(image, len(zone['images']))
+                  for zone in self.zone_manifest.neighbors(zone_name, ahead=self.depth, behind=1)
+                  for image in zone['images']]
+        paths = []
+        for image in images:
+            size = image_bytes(image)
+            if size > budget:
+                break
+            budget -= size
+            paths.append(image['path'])
+        with self._condition:
+            self._generation += 1
+            self._pending = paths
+            self._condition.notify()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                paths, self._pending = self._pending, None
+                generation = self._generation
+
+            for path in paths:
+                # A newer zone change supersedes this batch
+                if generation != self._generation or not self._running:
+                    break
+                if path not in self.texture_cache:
+                    self.texture_cache.prefetch(path, self.dispatch)
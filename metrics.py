@@ -0,0 +1,180 @@
+import bisect
+import json
+import threading
+import time
+from file_utils import atomic_write
+
+# Upper bounds in milliseconds; anything slower lands in the overflow bucket
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SIZE_BUCKETS_BYTES = (0, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+METRICS_FILE = "metrics.json"
+
+class Counter:
+    """Monotonic count of something that happened"""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+class Histogram:
+    """Fixed-bucket distribution of observed values (latencies, sizes).
+
+    Keeps counts per bucket plus count/sum/min/max, so recording is O(log
+    buckets) and memory is constant no matter how many values are seen.
+    Percentiles are reported as the upper bound of the bucket they fall in.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction):
+        with self._lock:
+            if self.count == 0:
+                return None
+            target = fraction * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= target:
+                    return self.buckets[index] if index < len(self.buckets) else self.max
+            return self.max
+
+    def snapshot(self):
+        with self._lock:
+            count, total = self.count, self.total
+            minimum, maximum = self.min, self.max
+            buckets = {str(bound): n for bound, n in zip(self.buckets, self.counts) if n}
+            if self.counts[-1]:
+                buckets["+inf"] = self.counts[-1]
+        return {
+            "count": count,
+            "mean": total / count if count else None,
+            "min": minimum,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": maximum,
+            "buckets": buckets
+        }
+
+class Timer:
+    """Context manager that records elapsed milliseconds into a histogram"""
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe((time.perf_counter() - self.start) * 1000)
+        return False
+
+class MetricsRegistry:
+    """Named counters, histograms and gauges for the running app.
+
+    Counters and histograms are created on first use. Gauges are callables
+    read at snapshot time, for values another component already tracks
+    (e.g. texture cache stats).
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def counter(self, name):
+        with self._lock:
+            if name not in self._counters:
+                self._counters[name] = Counter()
+            return self._counters[name]
+
+    def histogram(self, name, buckets=LATENCY_BUCKETS_MS):
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = Histogram(buckets)
+            return self._histograms[name]
+
+    def timer(self, name):
+        """with metrics.timer("x_ms"): ... records the block's duration"""
+        return Timer(self.histogram(name))
+
+    def gauge(self, name, read):
+        """Register read() as the source of a gauge's value"""
+        with self._lock:
+            self._gauges[name] = read
+
+    def snapshot(self):
+        """Every metric's current value as a JSON-friendly dict"""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = dict(self._histograms)
+            gauges = dict(self._gauges)
+        gauge_values = {}
+        for name, read in sorted(gauges.items()):
+            try:
+                gauge_values[name] = read()
+            except Exception as e:
+                gauge_values[name] = f"error: {e}"
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "counters": {name: counter.snapshot() for name, counter in sorted(counters.items())},
+            "histograms": {name: histogram.snapshot() for name, histogram in sorted(histograms.items())},
+            "gauges": gauge_values
+        }
+
+    def dump(self, path=METRICS_FILE):
+        """Write a snapshot to path (atomically); returns the path"""
+        atomic_write(path, json.dumps(self.snapshot(), indent=2))
+        return path
+
+    def format_lines(self):
+        """Short human-readable lines for the debug panel"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in snapshot["gauges"].items():
+            lines.append(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name}: {value}")
+        for name, h in snapshot["histograms"].items():
+            if h["count"]:
+                lines.append(f"{name}: n={h['count']} mean={h['mean']:.2f} p50<={h['p50']:g} "
+                             f"p95<={h['p95']:g} max={h['max']:.2f}")
+        return lines
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_metrics():
+    """Shared registry for the process"""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = MetricsRegistry()
+    return _metrics
@@ -0,0 +1,106 @@
+# Local test client for overlay_server.py, e.g.
+#   python overlay_client.py --port 8765 --viewers 50 --seconds 30
+# Connects WebSocket viewers and prints each pushed state, then checks that
+# map images come back resized and that a repeat request with the ETag gets a 304.
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+from overlay_server import read_websocket_frame
+
+async def http_get(host, port, target, headers=None):
+    """Minimal HTTP/1.1 GET; returns (status, headers, body)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    lines = [f"GET {target} HTTP/1.1", f"Host: {host}:{port}", "Connection: close"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1').split("\r\n")
+    status = int(head[0].split(" ")[1])
+    response_headers = {}
+    for line in head[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            response_headers[name.strip().lower()] = value.strip()
+    length = int(response_headers.get("content-length", 0))
+    body = await reader.readexactly(length) if length else b""
+    writer.close()
+    return status, response_headers, body
+
+async def websocket_viewer(host, port, name, on_state, stop):
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode('ascii')
+    writer.write((f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode('ascii'))
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if b" 101 " not in head.split(b"\r\n")[0]:
+        raise RuntimeError(f"{name}: handshake failed: {head[:40]!r}")
+    try:
+        while not stop.is_set():
+            try:
+                opcode, payload = await asyncio.wait_for(read_websocket_frame(reader), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            if opcode == 0x1:
+                on_state(name, json.loads(payload))
+            elif opcode == 0x8:
+                return
+    finally:
+        writer.close()
+
+async def check_maps(host, port, state, width):
+    for map_info in state.get("maps", []):
+        target = f"{map_info['url']}?width={width}"
+        start = time.perf_counter()
+        status, headers, body = await http_get(host, port, target)
+        first_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        repeat_status, _, _ = await http_get(host, port, target, {"If-None-Match": headers.get("etag", "")})
+        repeat_ms = (time.perf_counter() - start) * 1000
+        print(f"  {target}: {status} {len(body)} bytes in {first_ms:.1f} ms, "
+              f"repeat with ETag -> {repeat_status} in {repeat_ms:.1f} ms")
+
+async def run(args):
+    status, _, body = await http_get(args.host, args.port, "/state")
+    print(f"GET /state -> {status}: {body.decode('utf-8')[:200]}")
+    received = {}
+    checked_zones = set()
+    # Strong references - the loop would otherwise let a pending check be garbage collected
+    tasks = set()
+
+    def on_state(name, state):
+        received[name] = received.get(name, 0) + 1
+        if name == "viewer-0":
+            print(f"[{time.strftime('%H:%M:%S')}] zone={state.get('zone')} level={state.get('level')} "
+                  f"flask={(state.get('flask') or {}).get('name')} maps={len(state.get('maps', []))}")
+            if state.get("zone") not in checked_zones:
+                checked_zones.add(state.get("zone"))
+                task = asyncio.ensure_future(check_maps(args.host, args.port, state, args.width))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+    stop = asyncio.Event()
+    viewers = [asyncio.ensure_future(websocket_viewer(args.host, args.port, f"viewer-{i}", on_state, stop))
+               for i in range(args.viewers)]
+    await asyncio.sleep(args.seconds)
+    stop.set()
+    await asyncio.gather(*viewers, return_exceptions=True)
+    for task in list(tasks):
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print(f"{len(received)} of {args.viewers} viewers received {sum(received.values())} states")
+
+def main():
+    parser = argparse.ArgumentParser(description="Test client for the overlay server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--viewers", type=int, default=1, help="WebSocket viewers to connect")
+    parser.add_argument("--seconds", type=float, default=10, help="how long to listen for pushes")
+    parser.add_argument("--width", type=int, default=480, help="map width to request")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import struct
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit, parse_qs
+from path_utils import open_resource_file
+from tracker_engine import recommend
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# Requested widths are rounded up to a multiple of this so viewers share cached images
+WIDTH_STEP = 64
+MAX_HEADER_BYTES = 16 * 1024
+# Slow viewers are dropped rather than holding up everyone else's push
+SEND_TIMEOUT = 5.0
+
+OVERLAY_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>PoE2 Overlay</title>
+<style>
+body { background: transparent; color: #eee; font-family: sans-serif; margin: 0; }
+#zone { font-size: 24px; color: #ffd700; } #level { color: #00ff64; }
+.pick { color: #66ccff; } #notes { color: #ccc; } #maps img { margin-right: 8px; }
+</style></head>
+<body>
+<div><span id="zone">Waiting for zone...</span> <span id="level"></span></div>
+<div class="pick" id="flask"></div><div class="pick" id="weapon"></div>
+<div id="maps"></div><div id="notes"></div>
+<script>
+const width = new URLSearchParams(location.search).get("width") || 480;
+function show(state) {
+  document.getElementById("zone").textContent = state.zone || "Unknown";
+  document.getElementById("level").textContent = state.level ? "Lv." + state.level : "";
+  document.getElementById("flask").textContent = state.flask ? "Flask: " + state.flask.name : "";
+  document.getElementById("weapon").textContent = state.weapon ? "Weapon: " + state.weapon.name : "";
+  document.getElementById("notes").textContent = state.notes || "";
+  document.getElementById("maps").innerHTML = (state.maps || [])
+    .map(m => '<img src="' + m.url + '?width=' + width + '">').join("");
+}
+function connect() {
+  const socket = new WebSocket("ws://" + location.host + "/ws");
+  socket.onmessage = e => show(JSON.parse(e.data));
+  socket.onclose = () => setTimeout(connect, 2000);
+}
+connect();
+</script></body></html>
+"""
+
+def build_overlay_state(zone, level, weapon_type="", zone_manifest=None, stats=None):
+    """What overlays show: zone, level, flask/weapon picks, notes and map image URLs"""
+    state = {"zone": zone or None, "level": level, "notes": "", "maps": []}
+    state.update(recommend(level, weapon_type, stats))
+    entry = zone_manifest.get(zone) if zone_manifest and zone else None
+    if entry:
+        state["notes"] = entry["notes"]
+        state["maps"] = [
+            {"url": f"/maps/{entry['index']}/{i}", "width": image["width"], "height": image["height"]}
+            for i, image in enumerate(entry["images"])
+        ]
+    return state
+
+def websocket_frame(payload, opcode=0x1):
+    """Encode one unmasked (server to client) WebSocket frame"""
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 1 << 16:
+        header += bytes([126]) + struct.pack('>H', length)
+    else:
+        header += bytes([127]) + struct.pack('>Q', length)
+    return header + payload
+
+async def read_websocket_frame(reader):
+    """Read one client frame; returns (opcode, payload)"""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('>H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack('>Q', await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+class ResizedImageCache:
+    """LRU of encoded, resized map images keyed by (source path, width).
+
+    Resizing runs on the executor, and concurrent requests for the same key
+    share one in-flight job, so a burst of viewers asking for the same map
+    costs one resize.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, select_source=None):
+        self.max_bytes = max_bytes
+        # select_source(image, width, height) -> image dict, e.g. ImagePyramid.select to resize from a smaller level
+        self.select_source = select_source
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+
+    def _render(self, image, width):
+        from PIL import Image
+        source = self.select_source(image, width, 0) if self.select_source else image
+        with open_resource_file(source['path']) as f, Image.open(f) as picture:
+            if picture.width > width:
+                height = max(1, round(picture.height * width / picture.width))
+                picture = picture.resize((width, height), Image.BILINEAR)
+            buffer = io.BytesIO()
+            picture.save(buffer, format='PNG', compress_level=1)
+        data = buffer.getvalue()
+        return data, '"' + hashlib.sha1(data).hexdigest() + '"'
+
+    async def get(self, image, width):
+        """(png bytes, etag) for image at width"""
+        key = (image['path'], width)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        future = self._in_flight.get(key)
+        if future is None:
+            self.misses += 1
+            future = asyncio.get_running_loop().run_in_executor(None, self._render, image, width)
+            self._in_flight[key] = future
+            try:
+                entry = await future
+            finally:
+                del self._in_flight[key]
+            self._entries[key] = entry
+            self.total_bytes += len(entry[0])
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (data, _) = self._entries.popitem(last=False)
+                self.total_bytes -= len(data)
+            return entry
+        return await future
+
+class OverlayServer:
+    """HTTP + WebSocket server for browser overlays, on its own asyncio thread.
+
+    GET /        overlay page (add ?width=N to size the maps)
+    GET /state   current state as JSON
+    GET /ws      WebSocket; the state is pushed on connect and on every change
+    GET /maps/<zone index>/<image index>?width=N
+                 map image resized to width, with ETag / If-None-Match support
+
+    publish(state) may be called from any thread.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, zone_manifest=None, select_source=None):
+        self.host = host
+        self.port = port
+        self.zone_manifest = zone_manifest
+        self.images = ResizedImageCache(select_source=select_source)
+        self.state = {}
+        self._state_frame = websocket_frame(b"{}")
+        self._clients = set()
+        # The loop only holds weak references to tasks, so background sends are kept here until done
+        self._tasks = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self.requests = 0
+        self.not_modified = 0
+        self.pushes = 0
+
+    def start(self):
+        """Run the server on a background thread; returns once it is listening"""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_connection, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+            print(f"Overlay server listening on http://{self.host}:{self.port}/")
+        except OSError as e:
+            print(f"Error starting overlay server: {e}")
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            for task in list(self._tasks):
+                task.cancel()
+            if self._tasks:
+                self._loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    def stop(self):
+        if self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def publish(self, state):
+        """Make state current and push it to every WebSocket viewer (thread-safe)"""
+        if self._loop is None or not self._loop.is_running():
+            self._set_state(state)
+            return
+        self._loop.call_soon_threadsafe(self._broadcast, state)
+
+    def _set_state(self, state):
+        self.state = state
+        # Encoded once, written to every viewer
+        self._state_frame = websocket_frame(json.dumps(state).encode('utf-8'))
+
+    def _broadcast(self, state):
+        if state == self.state:
+            return
+        self._set_state(state)
+        frame = self._state_frame
+        for writer in list(self._clients):
+            writer.write(frame)
+            self.pushes += 1
+            task = self._loop.create_task(self._drain_or_drop(writer))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _drain_or_drop(self, writer):
+        try:
+            await asyncio.wait_for(writer.drain(), SEND_TIMEOUT)
+        except Exception:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                if len(head) > MAX_HEADER_BYTES:
+                    return
+                lines = head.decode('latin-1').split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                if int(headers.get("content-length", 0) or 0):
+                    await reader.readexactly(int(headers["content-length"]))
+                self.requests += 1
+
+                url = urlsplit(target)
+                if url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                    await self._serve_websocket(reader, writer, headers)
+                    return
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if method not in ("GET", "HEAD"):
+                    await self._respond(writer, 405, b"Method not allowed", keep_alive=keep_alive)
+                else:
+                    await self._route(writer, url, headers, keep_alive, method == "HEAD")
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"Overlay server error: {e}")
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, body, content_type="text/plain; charset=utf-8",
+                       headers=None, keep_alive=True, head_only=False):
+        reasons = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+                   405: "Method Not Allowed", 500: "Internal Server Error"}
+        lines = [f"HTTP/1.1 {status} {reasons.get(status, '')}",
+                 f"Content-Length: {len(body) if status != 304 else 0}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                 "Access-Control-Allow-Origin: *"]
+        if status != 304:
+            lines.append(f"Content-Type: {content_type}")
+        for name, value in (headers or {}).items():
+            lines.append(f"{name}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        if status != 304 and not head_only:
+            writer.write(body)
+        await writer.drain()
+
+    async def _route(self, writer, url, headers, keep_alive, head_only):
+        path = url.path
+        if path in ("/", "/index.html"):
+            await self._respond(writer, 200, OVERLAY_PAGE.encode('utf-8'), "text/html; charset=utf-8",
+                                keep_alive=keep_alive, head_only=head_only)
+        elif path == "/state":
+            await self._respond(writer, 200, json.dumps(self.state).encode('utf-8'), "application/json",
+                                headers={"Cache-Control": "no-store"}, keep_alive=keep_alive, head_only=head_only)
+        elif path.startswith("/maps/"):
+            await self._serve_map(writer, path, parse_qs(url.query), headers, keep_alive, head_only)
+        else:
+            await self._respond(writer, 404, b"Not found", keep_alive=keep_alive)
+
+    def _find_image(self, path):
+        parts = path.strip("/").split("/")
+        if len(parts) != 3 or not self.zone_manifest:
+            return None
+        try:
+            zone_index, image_index = int(parts[1]), int(parts[2])
+            if zone_index < 0 or image_index < 0:
+                return None
+            return self.zone_manifest.ordered[zone_index]["images"][image_index]
+        except (ValueError, IndexError):
+            return None
+
+    async def _serve_map(self, writer, path, query, headers, keep_alive, head_only):
+        image = self._find_image(path)
+        if image is None:
+            await self._respond(writer, 404, b"No such map", keep_alive=keep_alive)
+            return
+        source_width = image["width"] or 4096
+        try:
+            requested = int(query.get("width", [source_width])[0])
+        except ValueError:
+            await self._respond(writer, 400, b"width must be a number", keep_alive=keep_alive)
+            return
+        width = min(source_width, max(WIDTH_STEP, -(-requested // WIDTH_STEP) * WIDTH_STEP))
+        try:
+            data, etag = await self.images.get(image, width)
+        except Exception as e:
+            print(f"Error resizing map {image['path']}: {e}")
+            await self._respond(writer, 500, b"Could not load map", keep_alive=keep_alive)
+            return
+        cache_headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+        if headers.get("if-none-match") == etag:
+            self.not_modified += 1
+            await self._respond(writer, 304, b"", headers=cache_headers, keep_alive=keep_alive)
+        else:
+            await self._respond(writer, 200, data, "image/png", headers=cache_headers,
+                                keep_alive=keep_alive, head_only=head_only)
+
+    async def _serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await self._respond(writer, 400, b"Missing Sec-WebSocket-Key", keep_alive=False)
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()).decode('ascii')
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode('ascii'))
+        writer.write(self._state_frame)
+        await writer.drain()
+        self._clients.add(writer)
+        try:
+            # Viewers don't send anything useful - just answer pings and closes
+            while True:
+                opcode, payload = await read_websocket_frame(reader)
+                if opcode == 0x8:
+                    writer.write(websocket_frame(payload[:2], opcode=0x8))
+                    await writer.drain()
+                    return
+                if opcode == 0x9:
+                    writer.write(websocket_frame(payload, opcode=0xA))
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._clients.discard(writer)
+
+    def stats(self):
+        return {
+            "viewers": len(self._clients),
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "pushes": self.pushes,
+            "image_hits": self.images.hits,
+            "image_misses": self.images.misses,
+            "image_bytes": self.images.total_bytes
+        }
@@ -1,21 +1,138 @@
+import io
+import json
 import os
 import sys
+import threading
+from asset_pack import AssetPack
+
+ASSET_PACK_NAME = "assets.pak"
+# Where packed files are written when something needs a real path (e.g. dpg.load_image)
+ASSET_EXTRACT_DIR = "asset_cache"
+
+_asset_pack = None
+_asset_pack_checked = False
+_asset_pack_lock = threading.Lock()
+
+def get_app_dir():
+    """Directory of the executable (frozen) or of this source file"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(os.path.abspath(sys.executable))
+    return os.path.dirname(os.path.abspath(__file__))
+
+def get_asset_pack():
+    """The assets.pak shipped next to the app, or None when running from loose files"""
+    global _asset_pack, _asset_pack_checked
+    if not _asset_pack_checked:
+        with _asset_pack_lock:
+            if not _asset_pack_checked:
+                pack_path = os.path.join(get_app_dir(), ASSET_PACK_NAME)
+                if os.path.exists(pack_path):
+                    try:
+                        _asset_pack = AssetPack(pack_path)
+                        print(f"Using asset pack: {pack_path}")
+                    except Exception as e:
+                        print(f"Error opening asset pack {pack_path}: {e}")
+                _asset_pack_checked = True
+    return _asset_pack
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller"""
+    pack = get_asset_pack()
+    if pack is not None:
+        # Packed files live at this path once extracted - see ensure_resource_file
+        return os.path.join(get_app_dir(), ASSET_EXTRACT_DIR, pack.stamp, relative_path)
+
     try:
         # PyInstaller creates a temp folder and stores path in _MEIPASS
         base_path = sys._MEIPASS
     except AttributeError:
         # We're running in development mode
         base_path = os.path.dirname(os.path.abspath(__file__))
-    
+
     return os.path.join(base_path, relative_path)
 
+def _pack_relative_path(path):
+    """Map a path from get_resource_path back to its key in the asset pack"""
+    pack = get_asset_pack()
+    if pack is None:
+        return None
+    root = os.path.join(get_app_dir(), ASSET_EXTRACT_DIR, pack.stamp)
+    relative_path = os.path.relpath(os.path.abspath(path), root)
+    return None if relative_path.startswith('..') else relative_path
+
+def ensure_resource_file(path):
+    """Make sure a resource path exists on disk, extracting it from the pack on first use"""
+    if os.path.exists(path):
+        return path
+    relative_path = _pack_relative_path(path)
+    if relative_path is not None and relative_path in get_asset_pack():
+        get_asset_pack().extract(relative_path, path)
+    return path
+
+def _packed_bytes(path):
+    """Pack bytes for a resource path that hasn't been extracted, else None"""
+    if os.path.exists(path):
+        return None
+    relative_path = _pack_relative_path(path)
+    if relative_path is None or relative_path not in get_asset_pack():
+        return None
+    return get_asset_pack().get(relative_path)
+
+def open_resource_file(path):
+    """Binary file object for a resource path, read straight from the pack if it's packed"""
+    data = _packed_bytes(path)
+    if data is not None:
+        return io.BytesIO(data)
+    return open(path, 'rb')
+
+def resource_file_version(path):
+    """(size, version) of a resource path; changes whenever its contents may have"""
+    data = _packed_bytes(path)
+    if data is not None:
+        # Packed contents only change with the pack
+        return len(data), get_asset_pack().stamp
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+def read_resource_bytes(relative_path):
+    """Bytes of a resource - a zero-copy slice of the asset pack when there is one"""
+    pack = get_asset_pack()
+    if pack is not None:
+        return pack.get(relative_path)
+    with open(get_resource_path(relative_path), 'rb') as f:
+        return f.read()
+
+def read_resource_head(relative_path, length):
+    """First length bytes of a resource without reading the rest"""
+    pack = get_asset_pack()
+    if pack is not None:
+        return bytes(pack.get(relative_path)[:length])
+    with open(get_resource_path(relative_path), 'rb') as f:
+        return f.read(length)
+
+def read_resource_text(relative_path):
+    return str(read_resource_bytes(relative_path), 'utf-8')
+
+def read_resource_json(relative_path):
+    return json.loads(read_resource_text(relative_path))
+
+def is_resource_dir(relative_path):
+    pack = get_asset_pack()
+    if pack is not None:
+        return pack.is_dir(relative_path)
+    return os.path.isdir(get_resource_path(relative_path))
+
+def list_resource_dir(relative_path):
+    """Names inside a resource directory, like os.listdir"""
+    pack = get_asset_pack()
+    if pack is not None:
+        return pack.listdir(relative_path)
+    return os.listdir(get_resource_path(relative_path))
+
 def get_data_file_path(filename):
     """Get path to data file in data directory"""
     return get_resource_path(os.path.join('data', filename))
 
 def get_image_file_path(relative_image_path):
     """Get path to image file"""
-    return get_resource_path(relative_image_path)
+    return ensure_resource_file(get_resource_path(relative_image_path))
@@ -1,26 +1,52 @@
+from startup_timer import StartupTimer
 import dearpygui.dearpygui as dpg
 import os
 import json
-import glob
 import threading
 import time
-import re
 import subprocess
 import sys
-from path_utils import get_resource_path, get_image_file_path
+from path_utils import (get_resource_path, get_image_file_path, ensure_resource_file,
+                        is_resource_dir, list_resource_dir)
+from log_utils import load_checkpoints, CHECKPOINT_FILE
+from tracker_engine import TrackerEngine
+from tracker_reactor import TrackerReactor
+from settings_store import SettingsStore
+from zone_manifest import ZoneManifest
+from texture_cache import TextureCache
+from map_prefetcher import MapPrefetcher
+from image_pyramid import ImagePyramid
+from ui_dispatch import UIDispatchQueue
+from view_model import ViewModel
+from overlay_server import OverlayServer, build_overlay_state
+from shared_state import SharedStateWriter
+from session_history import SessionHistory, HISTORY_FILE
+from tracker_engine import recommend
+from metrics import get_metrics, METRICS_FILE
+from recommendation_engine import get_engine
+from flask_utils import get_best_flask_for_level
+from weapon_utils import get_best_weapon_for_level, format_weapon_damage, format_weapon_stats
 
 class PoEMapsViewerFinal:
     def __init__(self):
+        self.startup_timer = StartupTimer()
         self.current_zone = ""
         self.current_level = 1
         self.player_level = None
         self.override_player_level = False
         self.settings = self.load_settings()
+        # Settings and checkpoint writes happen on background writers, never on the caller's thread
+        self.settings_store = SettingsStore('settings.json')
+        self.checkpoint_store = SettingsStore(CHECKPOINT_FILE)
         self.image_registry = {}
         self.flask_image_registry = {}
         self.monitoring = False
-        self.monitor_thread = None
-        self.last_file_size = 0  # Use file size monitoring like original
+        # One reactor thread follows every tracked log; self.tracker is the one being displayed
+        self.reactor = TrackerReactor(on_poll=self.on_log_polled)
+        self.tracker = None
+        # Zone/level per log as of the last checkpoint save
+        self.last_checkpoint_states = {}
+        self.last_checkpoint_time = 0
         
         # Store current flask/weapon for regex generation
         self.current_flask = None
@@ -29,6 +55,11 @@ class PoEMapsViewerFinal:
         # Debouncing for resize events
         self.resize_timer = None
         
+        # Map image widgets currently shown: (item id, size source, displayed level path)
+        self.map_widgets = []
+        # Viewport client size, recorded on the UI thread so workers can size maps without dpg calls
+        self.viewport_size = (1200, 800)
+        
         # Initialize level fields from settings
         self.player_level = self.settings.get("player_level", None)
         self.override_player_level = bool(self.settings.get("override_player_level", False))
@@ -36,23 +67,158 @@ class PoEMapsViewerFinal:
         # Initialize current_level from settings so UI shows correct data on startup
         self.current_level = self.settings.get("level", 1)
         
+        # Worker threads publish state and post UI work here; the render loop drains it each frame
+        self.ui_queue = UIDispatchQueue()
+        
+        # Tracks what each panel was built from so refreshes only touch panels that changed
+        self.view_model = ViewModel()
+        
+        # Runtime metrics, shown in the Debug section and optionally dumped to JSON
+        self.metrics = get_metrics()
+        # perf_counter time of the zone change waiting to be drawn, for zone-to-render latency
+        self.zone_changed_at = None
+        self.zone_render_pending = None
+        self.register_metric_gauges()
+        self.panel_updaters = {
+            "flask": self.update_flask_display,
+            "weapon": self.update_weapon_display,
+            "maps": self.update_map_display,
+            "notes": self.update_notes_display,
+        }
+        
+        # Filled in by the background startup thread (see startup_background)
+        self.zone_manifest = None
+        self.image_pyramid = None
+        self.map_prefetcher = None
+        self.startup_thread = None
+        # Optional HTTP/WebSocket server for browser overlays (overlay_port > 0)
+        self.overlay_server = None
+        # Memory-mapped state file for other local tools (see shared_state_reader.py); "" turns it off
+        self.shared_state = None
+        # Zone entries and level-ups for later analysis; "" turns the history off
+        self.history = None
+        
         print("Creating Dear PyGui context...")
         dpg.create_context()
         
-        print("Loading flask images...")
-        self.load_flask_images()
+        # Map textures are reused across zone changes/resizes and evicted LRU past the budget
+        self.texture_cache = TextureCache(self.settings.get("texture_cache_mb", 512) * 1024 * 1024)
         
         print("Setting up theme...")
         self.setup_theme()
         
         print("Creating GUI...")
         self.create_gui()
+        self.startup_timer.mark("context and GUI")
         
-        # Start monitoring by default if log path is available
-        self.auto_start_monitoring()
-        
-        # Update UI with initial level from settings
-        self.update_initial_display()
+        # Everything else (assets, log detection) waits until the window is on screen - see run()
+    
+    def on_first_frame(self):
+        """First frame rendered - kick off the rest of startup without blocking the UI"""
+        self.startup_timer.mark("first frame")
+        self.startup_thread = threading.Thread(target=self.startup_background, daemon=True)
+        self.startup_thread.start()
+    
+    def startup_background(self):
+        """Load assets and detect zone/level, filling panels in as each piece is ready"""
+        try:
+            # Index every zone folder once so zone changes don't walk the filesystem
+            self.zone_manifest = ZoneManifest.build("data/maps")
+            self.startup_timer.mark("zone manifest")
+            
+            # Downscaled copies of the maps, so we decode and upload only what the window can show
+            self.image_pyramid = ImagePyramid(self.settings.get("map_cache_dir", "map_cache"))
+            self.image_pyramid.build_all_in_background(
+                image['path'] for zone in self.zone_manifest.ordered for image in zone['images']
+            )
+            # Stage the next zones' maps in the background so the next zone change is a cache hit
+            self.map_prefetcher = MapPrefetcher(
+                self.texture_cache,
+                self.zone_manifest,
+                self.select_map_level,
+                dispatch=self.ui_queue.post,
+                depth=self.settings.get("prefetch_depth", 2),
+                max_bytes=self.settings.get("prefetch_mb", 256) * 1024 * 1024
+            )
+            self.startup_timer.mark("map cache setup")
+            
+            overlay_port = self.settings.get("overlay_port", 0)
+            if overlay_port:
+                self.overlay_server = OverlayServer(
+                    self.settings.get("overlay_host", "127.0.0.1"),
+                    overlay_port,
+                    self.zone_manifest,
+                    select_source=self.image_pyramid.select
+                ).start()
+            
+            # Opened before monitoring starts so the detected zone/level are recorded and published
+            self.open_state_outputs()
+            self.startup_timer.mark("history and shared state")
+            
+            get_engine()
+            self.startup_timer.mark("item tables")
+            self.publish_state()
+            
+            # Flask/weapon panels only depend on the level, so show them before log detection
+            self.ui_queue.post("initial_display", self.update_initial_display)
+            self.startup_timer.mark("initial panels")
+            
+            # Start monitoring by default if log path is available
+            self.auto_start_monitoring()
+            self.startup_timer.mark("log detection")
+            
+            print("Loading flask images...")
+            decoded = self.decode_flask_images()
+            self.ui_queue.post("flask_images", lambda: self.upload_flask_images(decoded))
+            self.startup_timer.mark("flask images")
+        except Exception as e:
+            print(f"Error during startup: {e}")
+    
+    def open_state_outputs(self):
+        """Open the session history and shared state file, if enabled in settings"""
+        history_file = self.settings.get("history_file", HISTORY_FILE)
+        if history_file:
+            try:
+                self.history = SessionHistory(history_file, act_lookup=self.get_zone_act)
+            except Exception as e:
+                print(f"Could not open session history {history_file}: {e}")
+        shared_state_file = self.settings.get("shared_state_file", "shared_state.bin")
+        if shared_state_file:
+            try:
+                self.shared_state = SharedStateWriter(shared_state_file)
+            except OSError as e:
+                print(f"Could not open shared state file {shared_state_file}: {e}")
+    
+    def register_metric_gauges(self):
+        """Expose values other components already track as metrics gauges"""
+        self.metrics.gauge("textures.count", lambda: self.texture_cache.stats()['textures'])
+        self.metrics.gauge("textures.mb", lambda: self.texture_cache.stats()['bytes'] / (1024 * 1024))
+        self.metrics.gauge("textures.hits", lambda: self.texture_cache.stats()['hits'])
+        self.metrics.gauge("textures.misses", lambda: self.texture_cache.stats()['misses'])
+        self.metrics.gauge("textures.hit_rate", self.texture_hit_rate)
+        self.metrics.gauge("textures.prefetched", lambda: self.texture_cache.stats()['prefetched'])
+        self.metrics.gauge("textures.evictions", lambda: self.texture_cache.stats()['evictions'])
+        self.metrics.gauge("logs.tracked", lambda: len(self.reactor.engines()))
+        self.metrics.gauge("ui_queue.posted", lambda: self.ui_queue.posted)
+        self.metrics.gauge("ui_queue.coalesced", lambda: self.ui_queue.coalesced)
+    
+    def texture_hit_rate(self):
+        stats = self.texture_cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        return stats['hits'] / lookups if lookups else 0.0
+    
+    def update_debug_panel(self):
+        """Refresh the metrics text, only while the Debug section is expanded"""
+        if dpg.is_item_visible("debug_metrics_text"):
+            dpg.set_value("debug_metrics_text", "\n".join(self.metrics.format_lines()))
+    
+    def dump_metrics(self):
+        """Write a JSON snapshot of every metric to the metrics file"""
+        try:
+            path = self.metrics.dump(self.settings.get("metrics_file", METRICS_FILE))
+            print(f"Metrics written to {path}")
+        except Exception as e:
+            print(f"Error writing metrics: {e}")
     
     def copy_to_clipboard_safe(self, text):
         """Copy text to clipboard using pyperclip"""
@@ -96,7 +262,20 @@ class PoEMapsViewerFinal:
                     "level": 1,
                     "regex": '"increased rar|move"',
                     "player_level": None,
-                    "override_player_level": False
+                    "override_player_level": False,
+                    "texture_cache_mb": 512,
+                    "prefetch_depth": 2,
+                    "prefetch_mb": 256,
+                    "map_cache_dir": "map_cache",
+                    "resize_debounce_ms": 150,
+                    "log_paths": [],
+                    "overlay_port": 0,
+                    "overlay_host": "127.0.0.1",
+                    "shared_state_file": "shared_state.bin",
+                    "history_file": HISTORY_FILE,
+                    "player_stats": None,
+                    "metrics_file": METRICS_FILE,
+                    "metrics_dump_on_exit": False
                 }
                 for key, default in defaults.items():
                     if key not in settings:
@@ -106,56 +285,44 @@ class PoEMapsViewerFinal:
             return {"log_path": "", "weapon_type": "", "level": 1}
 
     def save_settings(self):
-        """Save settings to JSON file"""
-        try:
-            with open('settings.json', 'w') as f:
-                json.dump(self.settings, f, indent=2)
-                print("Settings saved successfully")
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        """Queue settings to be written to the JSON file (write-behind, atomic)"""
+        self.settings_store.save(self.settings)
 
-    def load_flask_images(self):
-        """Load flask images into texture registry"""
-        flask_dir = get_resource_path("images/flasks")
-        if os.path.exists(flask_dir):
-            for flask_file in os.listdir(flask_dir):
+    def decode_flask_images(self):
+        """Decode flask images (safe off the UI thread); returns (name, width, height, data) tuples"""
+        decoded = []
+        flask_dir = "images/flasks"
+        if is_resource_dir(flask_dir):
+            for flask_file in list_resource_dir(flask_dir):
                 if flask_file.endswith(('.png', '.jpg', '.jpeg')):
-                    flask_path = os.path.join(flask_dir, flask_file)
+                    flask_path = get_resource_path(f"{flask_dir}/{flask_file}")
                     try:
-                        # Load image with Dear PyGui's built-in loader
-                        width, height, channels, data = dpg.load_image(flask_path)
+                        # Load image with Dear PyGui's built-in loader (needs a real file)
+                        width, height, channels, data = dpg.load_image(ensure_resource_file(flask_path))
                         if data is not None:
-                            flask_name = flask_file.split('.')[0]
-                            
-                            with dpg.texture_registry():
-                                texture_id = dpg.add_static_texture(width, height, data)
-                                self.flask_image_registry[flask_name] = {
-                                    'texture': texture_id,
-                                    'width': width,
-                                    'height': height
-                                }
-                            print(f"Loaded flask image: {flask_name}")
+                            decoded.append((flask_file.split('.')[0], width, height, data))
                     except Exception as e:
                         print(f"Error loading flask image {flask_file}: {e}")
         else:
-            print(f"Flask image directory not found: {flask_dir}")
+            print(f"Flask image directory not found: {get_resource_path(flask_dir)}")
+        return decoded
+    
+    def upload_flask_images(self, decoded):
+        """Create flask textures from decoded images and show the flask image (UI thread)"""
+        with dpg.texture_registry():
+            for flask_name, width, height, data in decoded:
+                texture_id = dpg.add_static_texture(width, height, data)
+                self.flask_image_registry[flask_name] = {
+                    'texture': texture_id,
+                    'width': width,
+                    'height': height
+                }
+                print(f"Loaded flask image: {flask_name}")
+        self.update_flask_display()
 
     def load_map_image(self, image_path):
-        """Load a map image and return texture info"""
-        try:
-            width, height, channels, data = dpg.load_image(image_path)
-            if data is not None:
-                with dpg.texture_registry():
-                    texture_id = dpg.add_static_texture(width, height, data)
-                    return {
-                        'texture': texture_id,
-                        'width': width,
-                        'height': height,
-                        'path': image_path
-                    }
-        except Exception as e:
-            print(f"Error loading map image {image_path}: {e}")
-        return None
+        """Load a map image and return texture info, reusing cached textures"""
+        return self.texture_cache.get(image_path)
 
     def create_gui(self):
         """Create the main GUI with single pane layout"""
@@ -203,6 +370,23 @@ class PoEMapsViewerFinal:
                         tag="level_input",
                         callback=self.on_level_change
                     )
+                
+                # Several game clients can be tracked at once - pick which one is displayed
+                with dpg.group(horizontal=True):
+                    dpg.add_combo(
+                        label="Active Log",
+                        items=self.tracked_log_paths(),
+                        default_value=self.settings.get("log_path", ""),
+                        width=300,
+                        tag="active_log_combo",
+                        callback=self.on_active_log_selected
+                    )
+                    dpg.add_button(label="Add Log", callback=self.add_log_path)
+            
+            # Debug section - live runtime metrics, collapsed by default
+            with dpg.collapsing_header(label="Debug", default_open=False):
+                dpg.add_button(label="Dump Metrics JSON", callback=self.dump_metrics)
+                dpg.add_text("", tag="debug_metrics_text", color=(180, 180, 180))
             
             dpg.add_separator()
             
@@ -260,48 +444,35 @@ class PoEMapsViewerFinal:
         self.settings["log_path"] = new_path
         print(f"Saved log path: {new_path}")
 
+    def get_zone_entry(self, zone_name):
+        """Manifest entry for a zone (None until the manifest has loaded)"""
+        return self.zone_manifest.get(zone_name) if self.zone_manifest else None
+
+    def get_zone_act(self, zone_name):
+        """Act of a zone (None until the manifest has loaded)"""
+        return self.zone_manifest.act_of(zone_name) if self.zone_manifest else None
+
     def find_zone_directory(self, zone_name):
         """Find the directory for a given zone name"""
-        maps_dir = get_resource_path("data/maps")
-        if not os.path.exists(maps_dir):
-            print(f"Maps directory not found: {maps_dir}")
-            return None
-        
-        for act_dir in os.listdir(maps_dir):
-            act_path = os.path.join(maps_dir, act_dir)
-            if os.path.isdir(act_path):
-                for zone_dir in os.listdir(act_path):
-                    zone_path = os.path.join(act_path, zone_dir)
-                    if os.path.isdir(zone_path):
-                        dir_zone_name = zone_dir.split('_', 1)[-1] if '_' in zone_dir else zone_dir
-                        if dir_zone_name.lower() == zone_name.lower():
-                            return zone_path
-        return None
+        zone = self.get_zone_entry(zone_name)
+        return zone['directory'] if zone else None
 
     def load_zone_notes(self, zone_name):
         """Load notes for a specific zone"""
-        zone_dir = self.find_zone_directory(zone_name)
-        if zone_dir:
-            notes_path = os.path.join(zone_dir, "notes.txt")
-            if os.path.exists(notes_path):
-                try:
-                    with open(notes_path, 'r', encoding='utf-8') as f:
-                        return f.read().strip()
-                except Exception as e:
-                    print(f"Error reading notes: {e}")
-        return ""
+        zone = self.get_zone_entry(zone_name)
+        return zone['notes'] if zone else ""
 
     def get_zone_images(self, zone_name):
-        """Get list of image files for a zone"""
-        zone_dir = self.find_zone_directory(zone_name)
-        if not zone_dir:
-            return []
-        
-        image_files = []
-        for ext in ['*.png', '*.jpg', '*.jpeg']:
-            image_files.extend(glob.glob(os.path.join(zone_dir, ext)))
-        
-        return image_files
+        """Get the manifest image entries (path and dimensions) for a zone"""
+        zone = self.get_zone_entry(zone_name)
+        return zone['images'] if zone else []
+    
+    def select_map_level(self, image, num_maps):
+        """Pick the cached resolution level of a map image for its display size"""
+        if not image['width'] or not image['height']:
+            return image
+        display_width, display_height = self.calculate_map_size(image, num_maps)
+        return self.image_pyramid.select(image, display_width, display_height)
 
     def clear_group_children(self, group_tag):
         """Clear all children from a group"""
@@ -313,9 +484,15 @@ class PoEMapsViewerFinal:
     def update_flask_display(self):
         """Update flask display with current level"""
         try:
-            from flask_utils import get_best_flask_for_level
             optimal_flask = get_best_flask_for_level(self.current_level)
             
+            # Same flask (and image availability) as on screen - nothing to rebuild
+            flask_key = optimal_flask['name'].lower().replace(' ', '-') if optimal_flask else None
+            content = (optimal_flask['name'] if optimal_flask else None,
+                       flask_key in self.flask_image_registry, None if optimal_flask else self.current_level)
+            if not self.view_model.content_changed("flask", content):
+                return
+            
             # Clear existing flask display
             self.clear_group_children("flask_display_group")
             
@@ -326,9 +503,6 @@ class PoEMapsViewerFinal:
                 flask_name = optimal_flask['name']
                 flask_level = optimal_flask['requiredLevel']
                 
-                # Try to show flask image
-                flask_key = flask_name.lower().replace(' ', '-')
-                
                 # Add new content to flask display
                 with dpg.group(parent="flask_display_group"):
                     dpg.add_text(f"{flask_name}")
@@ -351,28 +525,36 @@ class PoEMapsViewerFinal:
                     dpg.add_text(f"for level {self.current_level}")
         except Exception as e:
             print(f"Error loading flask: {e}")
+            self.view_model.invalidate("flask")
             self.clear_group_children("flask_display_group")
             with dpg.group(parent="flask_display_group"):
                 dpg.add_text("Flask data unavailable")
 
     def update_weapon_display(self):
         """Update weapon display with current level and weapon type"""
-        # Clear existing weapon display
-        self.clear_group_children("weapon_display_group")
-        
         weapon_type = self.settings.get("weapon_type", "")
         
         if not weapon_type:
-            # No weapon type selected
-            with dpg.group(parent="weapon_display_group"):
-                dpg.add_text("No weapon type selected")
-                dpg.add_text("Select weapon type in settings")
+            if self.view_model.content_changed("weapon", None):
+                # No weapon type selected
+                self.clear_group_children("weapon_display_group")
+                with dpg.group(parent="weapon_display_group"):
+                    dpg.add_text("No weapon type selected")
+                    dpg.add_text("Select weapon type in settings")
             return
         
         try:
-            # Import weapon utilities
-            from weapon_utils import get_best_weapon_for_level, format_weapon_damage, format_weapon_stats
-            optimal_weapon = get_best_weapon_for_level(self.current_level, weapon_type)
+            # player_stats ({"str": .., "dex": .., "int": ..}) limits picks to bases the character can wield
+            optimal_weapon = get_best_weapon_for_level(self.current_level, weapon_type,
+                                                       self.settings.get("player_stats"))
+            
+            # Same weapon as on screen - nothing to rebuild
+            content = (weapon_type, optimal_weapon['name'] if optimal_weapon else self.current_level)
+            if not self.view_model.content_changed("weapon", content):
+                return
+            
+            # Clear existing weapon display
+            self.clear_group_children("weapon_display_group")
             
             with dpg.group(parent="weapon_display_group"):
                 if optimal_weapon:
@@ -389,7 +571,7 @@ class PoEMapsViewerFinal:
                     damage_text = format_weapon_damage(optimal_weapon)
                     dpg.add_text(damage_text, color=(255, 204, 102))
                     
-                    # Stats (crit, aps, range)
+                    # Stats (dps, crit, aps, range)
                     stats_text = format_weapon_stats(optimal_weapon)
                     dpg.add_text(stats_text, color=(204, 204, 204))
                     
@@ -398,14 +580,10 @@ class PoEMapsViewerFinal:
                     dpg.add_text(f"No {weapon_type} found")
                     dpg.add_text(f"for level {self.current_level}")
                     
-        except ImportError:
-            # Weapon utilities not available - show placeholder
-            with dpg.group(parent="weapon_display_group"):
-                dpg.add_text(f"Best {weapon_type}")
-                dpg.add_text(f"for level {self.current_level}")
-                dpg.add_text("(Weapon data coming soon)")
         except Exception as e:
             print(f"Error loading weapon: {e}")
+            self.view_model.invalidate("weapon")
+            self.clear_group_children("weapon_display_group")
             with dpg.group(parent="weapon_display_group"):
                 dpg.add_text("Weapon data unavailable")
 
@@ -415,30 +593,44 @@ class PoEMapsViewerFinal:
             return
             
         # Get zone images
-        image_files = self.get_zone_images(self.current_zone)
+        zone_images = self.get_zone_images(self.current_zone)
         
-        if image_files:
-            print(f"Found {len(image_files)} map(s) for '{self.current_zone}' - updating display")
+        if zone_images:
+            print(f"Found {len(zone_images)} map(s) for '{self.current_zone}' - updating display")
+            
+            # Decode the smallest cached level that still fills the display size
+            image_levels = [self.select_map_level(image, len(zone_images)) for image in zone_images]
+            image_files = [level['path'] for level in image_levels]
+            
+            # Same zone at the same levels (e.g. a level-up) - the maps on screen are already right
+            if not self.view_model.content_changed("maps", tuple(image_files)):
+                return
             
             # Clear existing map display only if we have new maps to show
             self.clear_group_children("map_display_group")
             
+            # The old widgets are gone, so only the maps about to be shown need protecting
+            self.texture_cache.pin(image_files)
+            self.map_widgets = []
+            
             with dpg.group(horizontal=True, parent="map_display_group"):
                 # Display all maps side by side horizontally
                 for i, image_file in enumerate(image_files):
                     map_data = self.load_map_image(image_file)
                     
                     if map_data:
-                        # Calculate responsive image size
-                        display_width, display_height = self.calculate_map_size(map_data, len(image_files))
+                        # Size from the source image so every level is drawn at the same size
+                        size_source = zone_images[i] if zone_images[i]['width'] else map_data
+                        display_width, display_height = self.calculate_map_size(size_source, len(image_files))
                         
                         # Create a vertical group for each map (image + optional spacing)
                         with dpg.group():
-                            dpg.add_image(
+                            image_item = dpg.add_image(
                                 map_data['texture'],
                                 width=display_width,
                                 height=display_height
                             )
+                        self.map_widgets.append((image_item, size_source, image_file))
                         print(f"Displayed map image: {os.path.basename(image_file)} at {display_width}x{display_height}")
                         
                         # Add horizontal spacing between maps if there are multiple
@@ -446,20 +638,18 @@ class PoEMapsViewerFinal:
                             dpg.add_spacer(width=10)
                     else:
                         dpg.add_text(f"Could not load map: {os.path.basename(image_file)}")
+            
+            stats = self.texture_cache.stats()
+            print(f"Texture cache: {stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evictions, "
+                  f"{stats['textures']} textures ({stats['bytes'] / (1024 * 1024):.0f} MB)")
         else:
             print(f"No maps found for '{self.current_zone}' - keeping previous map")
             # Don't clear or change anything - keep previous map displayed
 
     def calculate_map_size(self, map_data, num_maps):
         """Calculate maximum map size to fill 100% of available space above notes footer"""
-        try:
-            # Get current viewport dimensions when needed
-            viewport_width = dpg.get_viewport_client_width()
-            viewport_height = dpg.get_viewport_client_height()
-        except:
-            # Reasonable defaults if viewport not ready
-            viewport_width = 1200
-            viewport_height = 800
+        # Size recorded by the UI thread - this also runs on the prefetch thread
+        viewport_width, viewport_height = self.viewport_size
         
         # Calculate available space for maps
         # Account for: left panel (200px) + small padding (10px)
@@ -490,16 +680,19 @@ class PoEMapsViewerFinal:
         width = max(200, width)
         height = max(150, height)
         
-        print(f"Calculated map size: {width}x{height} (viewport: {viewport_width}x{viewport_height}, available: {available_width}x{available_height})")
-        
         return width, height
 
     def update_notes_display(self):
         """Update notes display - compact single line format"""
-        # Clear existing notes display
-        self.clear_group_children("notes_display_group")
+        if not self.current_zone:
+            return
         
         notes = self.load_zone_notes(self.current_zone)
+        if not self.view_model.content_changed("notes", (self.current_zone, notes)):
+            return
+        
+        # Clear existing notes display
+        self.clear_group_children("notes_display_group")
         with dpg.group(horizontal=True, parent="notes_display_group"):
             dpg.add_text("Notes:", color=(255, 215, 0))
             if notes:
@@ -514,12 +707,8 @@ class PoEMapsViewerFinal:
     def update_initial_display(self):
         """Update the display with initial settings on startup"""
         try:
-            # Update level display text to match current_level from settings
-            dpg.set_value("level_text", f"Lv.{self.current_level}")
-            
-            # Update flask and weapon displays with initial level
-            self.update_flask_display()
-            self.update_weapon_display()
+            # Flask and weapon panels are built from the level in settings; no zone yet
+            self.refresh_display()
             
             print(f"Initial display updated with level {self.current_level} from settings")
         except Exception as e:
@@ -528,47 +717,94 @@ class PoEMapsViewerFinal:
     def on_level_change(self):
         """Called when level input changes - update immediately"""
         try:
-            new_level = dpg.get_value("level_input")
-            self.current_level = new_level
-            dpg.set_value("level_text", f"Lv.{new_level}")
+            self.current_level = dpg.get_value("level_input")
+            self.publish_state()
             
-            # Update displays that depend on level
-            self.update_flask_display()
-            self.update_weapon_display()
+            # Only the level-dependent panels (flask, weapon) are stale
+            self.request_refresh()
         except Exception as e:
             print(f"Error updating level: {e}")
     
+    def request_refresh(self):
+        """Ask the UI thread to rebuild from the latest state; bursts collapse into one refresh"""
+        self.ui_queue.post("refresh", self.refresh_display)
+    
     def refresh_display(self):
-        """Refresh the entire display"""
-        print(f"Refreshing display for zone: {self.current_zone}")
+        """Refresh the header and rebuild the panels whose inputs changed"""
         
-        if not self.current_zone:
-            return
-            
-        # Update all sections
-        self.update_flask_display()
-        self.update_weapon_display() 
-        self.update_map_display()
-        self.update_notes_display()
+        # Header reflects the latest published state
+        if self.current_zone:
+            dpg.set_value("zone_text", self.current_zone)
+        dpg.set_value("level_text", f"Lv.{self.current_level}")
+        dpg.set_value("level_input", self.current_level)
+        
+        state = {
+            "level": self.current_level,
+            "weapon_type": self.settings.get("weapon_type", ""),
+            "zone": self.current_zone,
+        }
+        stale = self.view_model.stale_panels(state)
+        self.metrics.counter("ui.refreshes").inc()
+        if stale:
+            print(f"Refreshing {', '.join(stale)} for zone {self.current_zone}, level {self.current_level}")
+        for panel in stale:
+            self.panel_updaters[panel]()
+        
+        # The zone change is on screen once the next frame has rendered - see run()
+        if self.zone_changed_at is not None:
+            self.zone_render_pending, self.zone_changed_at = self.zone_changed_at, None
+    
+    def update_viewport_size(self):
+        """Record the viewport client size (UI thread)"""
+        width = dpg.get_viewport_client_width()
+        height = dpg.get_viewport_client_height()
+        if width > 0 and height > 0:
+            self.viewport_size = (width, height)
+    
+    def relayout_maps(self):
+        """Resize the existing map widgets in place - no reload, decode or new textures"""
+        self.update_viewport_size()
+        num_maps = len(self.map_widgets)
+        for image_item, size_source, _ in self.map_widgets:
+            if dpg.does_item_exist(image_item):
+                width, height = self.calculate_map_size(size_source, num_maps)
+                dpg.configure_item(image_item, width=width, height=height)
+    
+    def maps_need_new_level(self):
+        """True if the window has grown past the resolution of the map levels on screen"""
+        num_maps = len(self.map_widgets)
+        for _, size_source, level_path in self.map_widgets:
+            if self.select_map_level(size_source, num_maps)['path'] != level_path:
+                return True
+        return False
     
     def on_resize(self):
-        """Debounced resize handler - only update after resize stops"""
+        """Resize handler - re-layout immediately, reload only if a different map level is needed"""
         if not self.current_zone:
             return
         
+        # Resize callbacks can arrive several times a frame - one re-layout per frame is enough
+        self.ui_queue.post("relayout", self.relayout_maps)
+        
         # Cancel previous timer if it exists
         if self.resize_timer:
             self.resize_timer.cancel()
         
-        # Set new timer to trigger after 200ms of no resize events
-        self.resize_timer = threading.Timer(0.2, self.delayed_resize_update)
+        # Swapping map resolution levels is the only expensive part, so debounce just that
+        debounce = self.settings.get("resize_debounce_ms", 150) / 1000
+        self.resize_timer = threading.Timer(debounce, self.delayed_resize_update)
         self.resize_timer.start()
     
     def delayed_resize_update(self):
-        """Actually update the map display after resize debouncing"""
-        print("Window resize complete - updating map sizes")
-        self.update_map_display()
+        """Resizing stopped (timer thread) - check the map levels on the UI thread"""
         self.resize_timer = None
+        self.ui_queue.post("resize_done", self.reload_maps_for_size)
+    
+    def reload_maps_for_size(self):
+        """Reload the maps if the new size calls for different levels (UI thread)"""
+        if self.maps_need_new_level():
+            print("Window resize complete - loading map levels for the new size")
+            self.update_map_display()
 
     def browse_log_file(self):
         """Open native file dialog to select log file"""
@@ -649,72 +885,222 @@ class PoEMapsViewerFinal:
         
         self.settings["log_path"] = new_log_path
         self.settings["weapon_type"] = dpg.get_value("weapon_type_combo")
+        for tracker in self.reactor.engines():
+            tracker.weapon_type = self.settings["weapon_type"]
         self.settings["level"] = dpg.get_value("level_input")
         self.save_settings()
         
         # Update current level from settings
         self.current_level = self.settings["level"]
-        dpg.set_value("level_text", f"Lv.{self.current_level}")
         
         # Restart monitoring if log path changed
         if old_log_path != new_log_path:
             print(f"Log path changed from '{old_log_path}' to '{new_log_path}' - restarting monitoring")
             self.restart_monitoring(new_log_path)
         
-        # Refresh display with new settings
-        self.refresh_display()
+        # Refresh display with new settings (on the UI thread, like every other refresh)
+        self.request_refresh()
+        self.publish_state()
+    
+    def tracked_log_paths(self):
+        """The active log followed by any extra logs from settings, without duplicates"""
+        paths = [self.settings.get("log_path", "")] + list(self.settings.get("log_paths", []))
+        return [path for index, path in enumerate(paths) if path and path not in paths[:index]]
     
-    def init_file_monitoring(self, log_path):
-        """Initialize file monitoring exactly like original"""
-        if os.path.exists(log_path):
-            self.last_file_size = os.path.getsize(log_path)
+    def track_log(self, log_path, active=False, resume=True):
+        """Start tracking log_path; the reactor thread detects its current zone/level"""
+        tracker = TrackerEngine(log_path, self.settings.get("weapon_type", ""))
+        tracker.add_listener(self.on_tracker_change)
+        if self.history:
+            tracker.add_listener(self.history.on_change)
+        if active:
+            # Set before syncing so the detected zone/level reach the display
+            self.tracker = tracker
+        # Syncing can scan a multi-GB log backwards, so it never runs on the caller's thread
+        checkpoint = load_checkpoints().get(log_path) if resume else None
+        self.reactor.add(tracker, checkpoint, on_synced=self.on_log_synced)
+        return tracker
+    
+    def sync_log_state(self, log_path, resume=True):
+        """Make log_path the displayed log and show its zone/level"""
+        tracker = self.reactor.get(log_path)
+        if tracker is None or not resume:
+            tracker = self.track_log(log_path, active=True, resume=resume)
+        self.tracker = tracker
+        self.show_log_state(tracker)
+    
+    def show_log_state(self, tracker):
+        """Display tracker's zone and level, clearing whatever the previous log left on screen"""
+        if tracker.zone:
+            self.check_current_zone(tracker.zone)
+        else:
+            # Nothing detected in this log yet - don't leave the previous log's zone on screen
+            self.clear_current_zone()
+        if tracker.level is not None:
+            self.check_player_level(tracker.level)
         else:
-            self.last_file_size = 0
+            # Nor the previous log's level and the flask/weapon picks made for it
+            self.reset_player_level()
+    
+    def clear_current_zone(self):
+        """Forget the displayed zone and blank the map and notes panels"""
+        self.current_zone = ""
+        self.publish_state()
+        self.ui_queue.post("clear_zone", self.clear_zone_display)
+    
+    def clear_zone_display(self):
+        """Reset the zone header, maps and notes to their no-zone state (UI thread)"""
+        if self.current_zone:
+            # A zone was detected before this ran - its refresh takes care of the panels
+            return
+        dpg.set_value("zone_text", "Unknown")
+        self.clear_group_children("map_display_group")
+        dpg.add_text("No zone selected", parent="map_display_group")
+        self.map_widgets = []
+        self.texture_cache.pin([])
+        self.clear_group_children("notes_display_group")
+        dpg.add_text("Notes:", color=(255, 215, 0), parent="notes_display_group")
+        dpg.add_text("No notes available", parent="notes_display_group")
+        # What's on screen no longer matches any zone's content
+        self.view_model.invalidate("maps")
+        self.view_model.invalidate("notes")
+    
+    def on_tracker_change(self, tracker, changed, event):
+        """Zone/level change reported by a tracker (on a worker thread) - publish state only"""
+        if tracker is not self.tracker:
+            # Background logs keep their own state until they're switched to
+            return
+        if "zone" in changed:
+            self.check_current_zone(tracker.zone)
+        if "level" in changed:
+            self.check_player_level(tracker.level)
+    
+    def on_log_synced(self, tracker):
+        """Reactor callback once a newly tracked log's zone/level are known"""
+        self.save_log_checkpoint()
+        if tracker is self.tracker:
+            self.ui_queue.post("log_synced", self.show_active_log_state)
+    
+    def show_active_log_state(self):
+        """Display the active log's zone/level (UI thread)"""
+        if self.tracker:
+            self.show_log_state(self.tracker)
+    
+    def on_log_polled(self, tracker, changes):
+        """Reactor callback after a log was read"""
+        self.save_log_checkpoint()
+        if tracker is self.tracker:
+            # Opened by the startup thread - may not exist yet
+            shared_state = self.shared_state
+            if shared_state and tracker.reader:
+                shared_state.update(log_offset=tracker.reader.line_offset)
+    
+    def save_log_checkpoint(self, force=False):
+        """Persist every tracked log's offset and zone/level, throttled unless a state changed"""
+        checkpoints = {}
+        for tracker in self.reactor.engines():
+            checkpoint = tracker.checkpoint()
+            if checkpoint:
+                checkpoints[tracker.log_path] = checkpoint
+        if not checkpoints:
+            return
+        states = {path: (checkpoint["zone"], checkpoint["level"]) for path, checkpoint in checkpoints.items()}
+        state_changed = states != self.last_checkpoint_states
+        if not (force or state_changed or time.monotonic() - self.last_checkpoint_time >= 5):
+            return
+        self.checkpoint_store.save(checkpoints)
+        self.last_checkpoint_states = states
+        self.last_checkpoint_time = time.monotonic()
+    
+    def update_log_combo(self):
+        """Show the tracked logs in the Active Log combo (UI thread)"""
+        dpg.configure_item("active_log_combo", items=self.tracked_log_paths())
+        dpg.set_value("active_log_combo", self.settings.get("log_path", ""))
+        dpg.set_value("log_path_input", self.settings.get("log_path", ""))
+    
+    def on_active_log_selected(self, sender, log_path):
+        """Switch the display to another tracked log"""
+        if not log_path or log_path == self.settings.get("log_path", ""):
+            return
+        print(f"Switching to log: {log_path}")
+        self.save_log_checkpoint(force=True)
+        old_log_path = self.settings.get("log_path", "")
+        # Keep the previous log tracked in the background
+        if old_log_path and old_log_path not in self.settings.get("log_paths", []):
+            self.settings.setdefault("log_paths", []).append(old_log_path)
+        self.settings["log_path"] = log_path
+        self.save_settings()
+        # The panels follow via request_refresh; widget updates happen on the UI thread
+        self.sync_log_state(log_path)
+        self.ui_queue.post("log_combo", self.update_log_combo)
+    
+    def add_log_path(self):
+        """Track the log in the path field alongside the others"""
+        log_path = dpg.get_value("log_path_input")
+        if not log_path or not os.path.exists(log_path):
+            print(f"Cannot add log - invalid log path: {log_path}")
+            return
+        if log_path in self.tracked_log_paths():
+            print(f"Already tracking {log_path}")
+            return
+        self.settings.setdefault("log_paths", []).append(log_path)
+        self.save_settings()
+        if self.monitoring:
+            self.track_log(log_path)
+        print(f"Tracking {len(self.tracked_log_paths())} logs")
+        self.ui_queue.post("log_combo", self.update_log_combo)
+    
+    def start_monitoring(self):
+        """Track every configured log from the reactor thread, displaying the active one"""
+        active_log = self.settings.get("log_path", "")
+        for log_path in self.tracked_log_paths():
+            if not os.path.exists(log_path):
+                print(f"Log not found - not tracking: {log_path}")
+                continue
+            if log_path == active_log:
+                self.sync_log_state(log_path)
+            elif self.reactor.get(log_path) is None:
+                self.track_log(log_path)
+        self.reactor.start()
+        self.monitoring = True
+    
+    def stop_monitoring(self):
+        self.monitoring = False
+        self.reactor.stop()
+        for tracker in self.reactor.engines():
+            parser = tracker.parser
+            print(f"{tracker.log_path}: parsed {parser.lines_parsed} log lines ({parser.lines_per_second:.0f} lines/sec)")
     
     def auto_start_monitoring(self):
         """Automatically start monitoring if log path is available and detect current zone/level"""
         log_path = self.settings.get("log_path", "")
         
         if log_path and os.path.exists(log_path):
-            # Immediately check current zone and level from existing logs
+            # Resume from the checkpoint, or detect current zone and level from existing logs
             print("Detecting current zone and level from existing logs...")
-            self.check_current_zone(log_path)
-            self.check_player_level(log_path)
-            
-            # Start monitoring
-            self.init_file_monitoring(log_path)
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self.monitor_log, daemon=True)
-            self.monitor_thread.start()
+            self.start_monitoring()
             print("Auto-started log monitoring")
         else:
             print("No valid log path in settings - monitoring not started")
     
     def restart_monitoring(self, new_log_path):
-        """Restart monitoring with a new log path"""
-        # Stop current monitoring if running
-        if self.monitoring:
-            print("Stopping current monitoring...")
-            self.monitoring = False
-            # Give the thread a moment to stop
-            if self.monitor_thread and self.monitor_thread.is_alive():
-                self.monitor_thread.join(timeout=1.0)
+        """Switch the active log to a new path (other tracked logs keep running)"""
+        old_tracker = self.tracker
+        if old_tracker and old_tracker.log_path not in self.settings.get("log_paths", []):
+            # The old active log isn't one of the extra logs - stop following it
+            self.reactor.remove(old_tracker.log_path)
         
         # Start monitoring with new path if valid
         if new_log_path and os.path.exists(new_log_path):
             print(f"Starting monitoring with new log path: {new_log_path}")
-            
-            # Immediately check current zone and level from new log
-            self.check_current_zone(new_log_path)
-            self.check_player_level(new_log_path)
-            
-            # Start monitoring with new path
-            self.init_file_monitoring(new_log_path)
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self.monitor_log, daemon=True)
-            self.monitor_thread.start()
+            if self.monitoring:
+                self.sync_log_state(new_log_path)
+            else:
+                self.start_monitoring()
+            self.ui_queue.post("log_combo", self.update_log_combo)
             print("Successfully restarted monitoring with new log path")
         else:
+            self.tracker = None
             print(f"Cannot start monitoring - invalid log path: {new_log_path}")
     
     def toggle_monitoring(self):
@@ -725,93 +1111,67 @@ class PoEMapsViewerFinal:
                 print("Invalid log path - cannot start monitoring")
                 return
             
-            # Initialize file monitoring
-            self.init_file_monitoring(log_path)
-            
             # Immediately detect current zone/level before starting monitoring
             print("Detecting current zone and level...")
-            self.check_current_zone(log_path)
-            self.check_player_level(log_path)
-            
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self.monitor_log, daemon=True)
-            self.monitor_thread.start()
+            self.settings["log_path"] = log_path
+            self.start_monitoring()
             
             dpg.set_value("monitor_button", "Stop Monitoring")
             print("Started log monitoring")
         else:
-            self.monitoring = False
+            self.stop_monitoring()
             dpg.set_value("monitor_button", "Start Monitoring")
             print("Stopped log monitoring")
     
-    def monitor_log(self):
-        """Monitor the PoE2 log file - EXACT original implementation"""
-        log_path = self.settings.get("log_path", "")
-        
-        while self.monitoring:
-            try:
-                if os.path.exists(log_path):
-                    current_size = os.path.getsize(log_path)
-                    if current_size > self.last_file_size:
-                        self.last_file_size = current_size
-                        # Call zone and level checks
-                        self.check_current_zone(log_path)
-                        self.check_player_level(log_path)
-                
-                time.sleep(2)  # Check every 2 seconds like original
-            except Exception as e:
-                print(f"Error monitoring log file: {e}")
-                time.sleep(5)  # Wait longer if there's an error
+    def publish_state(self):
+        """Push the displayed zone/level and picks to overlay viewers and the shared state file"""
+        weapon_type = self.settings.get("weapon_type", "")
+        if self.overlay_server:
+            self.overlay_server.publish(build_overlay_state(
+                self.current_zone, self.current_level, weapon_type, self.zone_manifest,
+                self.settings.get("player_stats")))
+        shared_state = self.shared_state
+        if shared_state:
+            picks = recommend(self.current_level, weapon_type, self.settings.get("player_stats"))
+            entry = self.get_zone_entry(self.current_zone) if self.current_zone else None
+            shared_state.update(
+                zone=self.current_zone,
+                level=self.current_level,
+                act=entry['act'] if entry else None,
+                zone_order=entry['order'] if entry else None,
+                zone_index=entry['index'] if entry else None,
+                flask_id=(picks["flask"] or {}).get("id"),
+                weapon_id=(picks["weapon"] or {}).get("id")
+            )
     
-    def check_current_zone(self, log_path):
-        """Check current zone - EXACT original implementation"""
+    def check_current_zone(self, zone):
+        """Publish a zone change from the tracker"""
         try:
-            if not os.path.exists(log_path):
-                return
-            
-            # Read the last 50 lines to find the most recent zone
-            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-            
-            zone_pattern = r'\[SCENE\] Set Source \[([^\]]+)\]'
-            current_zone = None
-            
-            # Search backwards through recent lines
-            for line in reversed(lines[-50:]):
-                match = re.search(zone_pattern, line)
-                if match:
-                    zone_name = match.group(1)
-                    if zone_name not in ["(null)", "(unknown)"]:
-                        current_zone = zone_name
-                        break
-            
-            if current_zone and current_zone != self.current_zone:
-                self.current_zone = current_zone
-                dpg.set_value("zone_text", self.current_zone)
-                self.refresh_display()
-                print(f"Zone changed to: {current_zone}")
+            if zone and zone != self.current_zone:
+                self.current_zone = zone
+                self.zone_changed_at = time.perf_counter()
+                self.request_refresh()
+                self.publish_state()
+                print(f"Zone changed to: {zone}")
+                if self.map_prefetcher:
+                    self.map_prefetcher.request(zone)
                 
         except Exception as e:
             print(f"Error checking zone: {e}")
     
-    def check_player_level(self, log_path):
-        """Check player level - EXACT original implementation"""
+    def reset_player_level(self):
+        """Forget the detected level and fall back to the level from settings"""
+        self.player_level = None
+        level = self.settings.get("level", 1)
+        if self.current_level != level:
+            self.current_level = level
+            # Flask and weapon panels follow the level
+            self.request_refresh()
+            self.publish_state()
+    
+    def check_player_level(self, found_level):
+        """Publish a level detected by the tracker"""
         try:
-            if not os.path.exists(log_path):
-                return
-            
-            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-            
-            # Search the last 200 lines for a level up message
-            level_regex = re.compile(r":\s*[^()]+\([^)]*\) is now level (\d+)")
-            found_level = None
-            for line in reversed(lines[-200:]):
-                m = level_regex.search(line)
-                if m:
-                    found_level = int(m.group(1))
-                    break
-            
             if found_level is not None:
                 # Update runtime
                 old_level = self.player_level
@@ -826,9 +1186,8 @@ class PoEMapsViewerFinal:
                 # Update flask and weapon displays if level changed
                 if old_level != found_level:
                     self.current_level = found_level
-                    dpg.set_value("level_text", f"Lv.{self.current_level}")
-                    dpg.set_value("level_input", self.current_level)
-                    self.refresh_display()
+                    self.request_refresh()
+                    self.publish_state()
         except Exception as e:
             print(f"Error checking player level: {e}")
     
@@ -893,11 +1252,47 @@ class PoEMapsViewerFinal:
         
         print("Showing viewport...")
         dpg.show_viewport()
+        self.startup_timer.mark("viewport shown")
         
         print("Starting Dear PyGui...")
-        dpg.start_dearpygui()
+        # Manual render loop so queued UI work from worker threads runs on this thread, once per frame
+        first_frame = True
+        frame_ms = self.metrics.histogram("ui.frame_ms")
+        last_debug_update = 0
+        while dpg.is_dearpygui_running():
+            frame_start = time.perf_counter()
+            self.ui_queue.drain()
+            dpg.render_dearpygui_frame()
+            now = time.perf_counter()
+            frame_ms.observe((now - frame_start) * 1000)
+            if self.zone_render_pending is not None:
+                self.metrics.histogram("ui.zone_to_render_ms").observe((now - self.zone_render_pending) * 1000)
+                self.zone_render_pending = None
+            if now - last_debug_update >= 0.5:
+                last_debug_update = now
+                self.update_debug_panel()
+            if first_frame:
+                # Defer asset loading and log detection until the window has drawn once
+                first_frame = False
+                self.update_viewport_size()
+                self.on_first_frame()
         
         print("Cleaning up...")
+        self.reactor.stop()
+        if self.overlay_server:
+            self.overlay_server.stop()
+        if self.shared_state:
+            self.shared_state.close()
+        if self.history:
+            self.history.close()
+        if self.map_prefetcher:
+            self.map_prefetcher.stop()
+        self.save_log_checkpoint(force=True)
+        if self.settings.get("metrics_dump_on_exit", False):
+            self.dump_metrics()
+        # Make sure queued settings/checkpoint writes reach disk before exiting
+        self.settings_store.close()
+        self.checkpoint_store.close()
         dpg.destroy_context()
         print("Done!")
 
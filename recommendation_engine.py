@@ -0,0 +1,97 @@
+import os
+import threading
+from path_utils import read_resource_json
+
+CATEGORIES_FILE = 'item_categories.json'
+DEFAULT_MAX_LEVEL = 100
+
+class ItemRecord:
+    """Compact view of one item table row; info is the original JSON entry"""
+    __slots__ = ('id', 'name', 'required_level', 'info')
+
+    def __init__(self, info):
+        self.id = info.get('id')
+        self.name = info.get('name')
+        self.required_level = info.get('requiredLevel', 0)
+        self.info = info
+
+class ItemTable:
+    """Items of one category with the best item precomputed for every level"""
+    __slots__ = ('name', 'records', 'best_by_level')
+
+    def __init__(self, name, items, max_level=DEFAULT_MAX_LEVEL):
+        self.name = name
+        self.records = tuple(ItemRecord(info) for info in items)
+        # best_by_level[level] is the usable item with the highest required level;
+        # on ties the first one listed wins, same as max() over the table
+        best = [None] * (max_level + 1)
+        for record in self.records:
+            for level in range(max(record.required_level, 0), max_level + 1):
+                current = best[level]
+                if current is None or record.required_level > current.required_level:
+                    best[level] = record
+        self.best_by_level = tuple(best)
+
+    def best_for_level(self, level):
+        if level is None or level < 1:
+            return None
+        return self.best_by_level[min(int(level), len(self.best_by_level) - 1)]
+
+class RecommendationEngine:
+    """Loads every item table once and answers best-item-per-level lookups in O(1).
+
+    Categories are described in data/item_categories.json: each names a
+    data file and the lists inside it (optionally filtered by type), so new
+    flask types, charms or weapon classes only need a data entry.
+    """
+
+    def __init__(self, categories_file=CATEGORIES_FILE):
+        self.tables = {}
+        self.aliases = {}
+        config = self._load_json(categories_file) or {}
+        max_level = config.get("maxLevel", DEFAULT_MAX_LEVEL)
+        data_files = {}
+        for category, spec in config.get("categories", {}).items():
+            file_name = spec["file"]
+            if file_name not in data_files:
+                data_files[file_name] = self._load_json(file_name) or {}
+            items = []
+            for source in spec.get("sources", []):
+                type_filter = source.get("typeContains", "").lower()
+                items.extend(item for item in data_files[file_name].get(source["key"], [])
+                             if type_filter in item.get("type", "").lower())
+            self.tables[category] = ItemTable(category, items, max_level)
+            for alias in spec.get("aliases", []):
+                self.aliases[alias] = category
+
+    @staticmethod
+    def _load_json(file_name):
+        path = os.path.join('data', file_name)
+        try:
+            return read_resource_json(path)
+        except Exception as e:
+            print(f"Error loading item data from {path}: {e}")
+            return None
+
+    def categories(self):
+        return list(self.tables)
+
+    def best_for_level(self, category, level):
+        """Return the JSON entry of the best item in category for level, or None"""
+        table = self.tables.get(self.aliases.get(category, category))
+        if table is None:
+            return None
+        record = table.best_for_level(level)
+        return record.info if record else None
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """Shared engine, loaded on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RecommendationEngine()
+    return _engine
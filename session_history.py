@@ -0,0 +1,246 @@
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from metrics import get_metrics
+from tracker_engine import parse_log_timestamp
+
+HISTORY_FILE = "session_history.db"
+# Longest gap counted as time in one zone - anything longer is the game being closed
+MAX_ZONE_STINT_SECONDS = 30 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    zone TEXT,
+    act INTEGER,
+    level INTEGER,
+    character TEXT,
+    log_path TEXT NOT NULL
+);
+-- The same log line is only stored once, however often it is re-detected or replayed
+CREATE UNIQUE INDEX IF NOT EXISTS events_unique
+    ON events (log_path, ts, kind, CASE kind WHEN 'zone' THEN zone WHEN 'level' THEN level ELSE '' END);
+CREATE INDEX IF NOT EXISTS events_by_character ON events (character, kind, ts);
+CREATE INDEX IF NOT EXISTS events_by_act ON events (character, kind, act, ts);
+"""
+
+# Queued at a session's first level-up: the session's zone rows in log_path were played
+# by character, at level - 1 up to ts
+CharacterFill = namedtuple('CharacterFill', ['character', 'level', 'log_path', 'ts'])
+
+class SessionHistory:
+    """Zone entries and level-ups stored in SQLite, written behind the tracker.
+
+    record() (or the on_change tracker listener) only queues a row; a writer
+    thread inserts queued rows in one transaction per batch of up to
+    `batch_size`, or every `flush_interval` seconds. The queue holds at most
+    `max_pending` rows - if the disk can't keep up, new rows are dropped and
+    counted rather than growing memory. Queries run on their own connection.
+
+    Zone entries don't name a character, so a zone row gets the character of
+    the log's latest level-up. A session (the log from its start, or from the
+    game reopening it, which is stored as a "session" row) begins with no
+    character: zones until its first level-up are stored without one and
+    filled in by that level-up, so a new character's first zones are never
+    credited to whoever played before.
+    """
+
+    def __init__(self, path=HISTORY_FILE, act_lookup=None, batch_size=500, flush_interval=1.0, max_pending=10000):
+        self.path = path
+        # zone name -> act number (or None); the GUI passes its zone manifest lookup
+        self.act_lookup = act_lookup
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self._queue = queue.Queue(maxsize=max_pending)
+        # log path -> character of the session's latest level-up / latest event time
+        self._characters = {}
+        self._latest = {}
+        self._closed = False
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+        get_metrics().gauge("history.pending", self._queue.qsize)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def on_change(self, engine, changed, event):
+        """TrackerEngine listener: record the engine's state after a zone or level change"""
+        timestamp = parse_log_timestamp(event.timestamp)
+        if timestamp is None:
+            # Restored from a checkpoint rather than read from the log
+            return
+        log_path = engine.log_path
+        if changed[0] == "session" or timestamp < self._latest.get(log_path, 0):
+            # A new session, or the log being read from further back (a replay, import
+            # or the startup scan) - who is playing isn't known until the next level-up
+            self._characters.pop(log_path, None)
+        self._latest[log_path] = max(timestamp, self._latest.get(log_path, 0))
+        character = getattr(event, "character", None)
+        if character:
+            if log_path not in self._characters:
+                # The session's zones so far were this character's
+                self._put(CharacterFill(character, event.level, log_path, timestamp))
+            self._characters[log_path] = character
+        else:
+            character = self._characters.get(log_path)
+        self.record(timestamp, changed[0], engine.zone, engine.level, character, log_path)
+
+    def record(self, timestamp, kind, zone, level, character, log_path):
+        """Queue one row; kind is "zone", "level" or "session". Returns False if it was dropped."""
+        act = self.act_lookup(zone) if self.act_lookup and zone else None
+        return self._put((timestamp, kind, zone, act, level, character, log_path))
+
+    def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.rows_dropped += 1
+            get_metrics().counter("history.dropped").inc()
+            return False
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far is in the database"""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        connection = self._connect()
+        try:
+            while True:
+                items, markers, stop = [], [], False
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+                # Take whatever else is already waiting, up to a batch
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        markers.append(item)
+                    else:
+                        items.append(item)
+                    if stop or len(items) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if items:
+                    self._write(connection, items)
+                for marker in markers:
+                    marker.set()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _write(self, connection, items):
+        written = 0
+        try:
+            with get_metrics().timer("history.batch_ms"), connection:
+                # In queue order, so a fill only sees the zone rows queued before its level-up
+                rows = []
+                for item in items:
+                    if not isinstance(item, CharacterFill):
+                        rows.append(item)
+                        continue
+                    written += self._insert(connection, rows)
+                    rows = []
+                    # Only within the level-up's session; zones logged after the level-up were
+                    # restored out of order (by the startup scan) and are already at the new level
+                    connection.execute(
+                        "UPDATE events SET character = :character, "
+                        "  level = CASE WHEN ts <= :ts THEN :level - 1 ELSE :level END "
+                        "WHERE character IS NULL AND kind = 'zone' AND log_path = :log_path "
+                        "  AND ts >= COALESCE((SELECT MAX(ts) FROM events WHERE log_path = :log_path "
+                        "    AND kind = 'session' AND ts <= :ts), 0) "
+                        "  AND ts < COALESCE((SELECT MIN(ts) FROM events WHERE log_path = :log_path "
+                        "    AND kind = 'session' AND ts > :ts), 1e300)",
+                        item._asdict())
+                written += self._insert(connection, rows)
+            self.rows_written += written
+            get_metrics().counter("history.rows_written").inc(written)
+        except sqlite3.Error as e:
+            print(f"Error writing session history: {e}")
+
+    def _insert(self, connection, rows):
+        """Insert rows; returns how many were new (rows already in the history are ignored)"""
+        before = connection.total_changes
+        connection.executemany(
+            "INSERT OR IGNORE INTO events (ts, kind, zone, act, level, character, log_path) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return connection.total_changes - before
+
+    def _query(self, sql, params=()):
+        connection = self._connect()
+        try:
+            connection.row_factory = sqlite3.Row
+            return [dict(row) for row in connection.execute(sql, params)]
+        finally:
+            connection.close()
+
+    def last_character(self, log_path=None):
+        """Most recent character in the history (for one log, if given), or None"""
+        if log_path:
+            rows = self._query("SELECT character FROM events WHERE log_path = ? AND character IS NOT NULL "
+                               "ORDER BY ts DESC LIMIT 1", (log_path,))
+        else:
+            rows = self._query("SELECT character FROM events WHERE character IS NOT NULL "
+                               "ORDER BY ts DESC LIMIT 1")
+        return rows[0]["character"] if rows else None
+
+    def characters(self):
+        """Every character with its level range and first/last event time"""
+        return self._query("SELECT character, MIN(level) AS min_level, MAX(level) AS max_level, "
+                           "MIN(ts) AS first_ts, MAX(ts) AS last_ts FROM events "
+                           "WHERE character IS NOT NULL GROUP BY character ORDER BY last_ts DESC")
+
+    def zone_times(self, character, since=None, max_stint=MAX_ZONE_STINT_SECONDS):
+        """Seconds spent in each zone by character (from `since`), longest first.
+
+        Each zone entry lasts until the next one, capped at max_stint; the
+        zone the character is still in counts from the next entry on.
+        """
+        return self._query(
+            "SELECT zone, act, COUNT(*) AS visits, SUM(MIN(COALESCE(next_ts - ts, 0), ?)) AS seconds FROM ("
+            "  SELECT zone, act, ts, LEAD(ts) OVER (ORDER BY ts, id) AS next_ts FROM events"
+            "  WHERE character IS ? AND kind = 'zone' AND ts >= ?"
+            ") GROUP BY zone ORDER BY seconds DESC",
+            (max_stint, character, since or 0))
+
+    def act_boundaries(self, character):
+        """First entry into each act: zone, time and the character's level at that point"""
+        # SQLite takes the bare columns from the row MIN(ts) picked
+        return self._query(
+            "SELECT act, zone, MIN(ts) AS ts, level FROM events "
+            "WHERE character IS ? AND kind = 'zone' AND act IS NOT NULL GROUP BY act ORDER BY act",
+            (character,))
+
+    def timeline(self, character, since=None, limit=1000):
+        """Recorded events for character in time order"""
+        return self._query("SELECT ts, kind, zone, act, level FROM events WHERE character IS ? AND ts >= ? "
+                           "ORDER BY ts, id LIMIT ?", (character, since or 0, limit))
@@ -0,0 +1,89 @@
+import json
+import threading
+import time
+from file_utils import atomic_write
+
+class SettingsStore:
+    """Write-behind JSON file, written atomically on a background thread.
+
+    save() only serializes a snapshot and returns; the writer thread waits
+    until saves have been quiet for `delay` seconds (at most `max_delay`
+    after the first one) and writes the latest snapshot once. flush() writes
+    anything pending right away and is what shutdown should call.
+    """
+
+    def __init__(self, path, delay=0.5, max_delay=2.0):
+        self.path = path
+        self.delay = delay
+        self.max_delay = max_delay
+        self.saves = 0
+        self.writes = 0
+        self._pending = None
+        self._first_save = 0
+        self._last_save = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        # Held while writing so flush() and the writer never write at the same time
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def save(self, data):
+        """Queue a snapshot of data to be written; never blocks on disk I/O"""
+        text = json.dumps(data, indent=2)
+        with self._condition:
+            now = time.monotonic()
+            if self._pending is None:
+                self._first_save = now
+            self._pending = text
+            self._last_save = now
+            self.saves += 1
+            self._condition.notify()
+
+    def _take_pending(self):
+        with self._condition:
+            text, self._pending = self._pending, None
+        return text
+
+    def _write(self, text):
+        try:
+            atomic_write(self.path, text)
+            self.writes += 1
+        except Exception as e:
+            print(f"Error saving {self.path}: {e}")
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                # Debounce: wait for a quiet period, but don't hold a write back forever
+                while self._pending is not None and not self._closed:
+                    now = time.monotonic()
+                    due = min(self._last_save + self.delay, self._first_save + self.max_delay)
+                    if now >= due:
+                        break
+                    self._condition.wait(due - now)
+                if self._closed:
+                    return
+            with self._write_lock:
+                text = self._take_pending()
+                if text is not None:
+                    self._write(text)
+
+    def flush(self):
+        """Write any pending snapshot now, on the calling thread"""
+        with self._write_lock:
+            text = self._take_pending()
+            if text is not None:
+                self._write(text)
+
+    def close(self):
+        """Stop the writer thread and write whatever is still pending"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join(timeout=5)
+        self.flush()
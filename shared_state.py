@@ -0,0 +1,90 @@
+import mmap
+import os
+import threading
+import time
+from shared_state_reader import (MAGIC, LAYOUT_VERSION, FILE_SIZE, HEADER, SEQUENCE, SEQUENCE_OFFSET,
+                                 PAYLOAD, PAYLOAD_OFFSET, TEXT_FIELD_SIZES)
+
+# Field defaults, meaning "unknown" to readers
+EMPTY_STATE = {
+    "log_offset": 0,
+    "zone_order": None,
+    "level": 0,
+    "act": 0,
+    "zone_index": -1,
+    "zone": "",
+    "flask_id": "",
+    "weapon_id": "",
+}
+
+def encode_text(value, size):
+    """UTF-8 bytes cut to fit a fixed field without splitting a character"""
+    data = (value or "").encode('utf-8')
+    if len(data) > size:
+        data = data[:size].decode('utf-8', errors='ignore').encode('utf-8')
+    return data
+
+class SharedStateWriter:
+    """Publishes the tracker state to a small memory-mapped file.
+
+    The layout lives in shared_state_reader.py. update() bumps the sequence
+    to odd, rewrites the payload in place and bumps it back to even, so
+    readers (other processes, AutoHotkey scripts) can poll the file at any
+    rate without locks or syscalls and retry the rare torn read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.state = dict(EMPTY_STATE)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != FILE_SIZE:
+                os.ftruncate(fd, FILE_SIZE)
+            self._map = mmap.mmap(fd, FILE_SIZE, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        # Continue an old file's sequence so readers that kept it mapped see the restart as an update
+        magic, version, _ = HEADER.unpack_from(self._map, 0)
+        if magic == MAGIC and version == LAYOUT_VERSION:
+            self._sequence = (SEQUENCE.unpack_from(self._map, SEQUENCE_OFFSET)[0] + 1) & ~1
+        self._write()
+        HEADER.pack_into(self._map, 0, MAGIC, LAYOUT_VERSION, FILE_SIZE)
+
+    def update(self, **fields):
+        """Change some fields (names from EMPTY_STATE); None resets a field to unknown"""
+        with self._lock:
+            changed = False
+            for name, value in fields.items():
+                if value is None:
+                    value = EMPTY_STATE[name]
+                elif name not in EMPTY_STATE:
+                    raise KeyError(name)
+                if self.state[name] != value:
+                    self.state[name] = value
+                    changed = True
+            if changed and self._map is not None:
+                self._write()
+            return changed
+
+    def _write(self):
+        state = self.state
+        zone_order = state["zone_order"]
+        self._sequence += 1
+        SEQUENCE.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+        PAYLOAD.pack_into(
+            self._map, PAYLOAD_OFFSET,
+            state["log_offset"], time.time(),
+            float('nan') if zone_order is None else float(zone_order),
+            state["level"], state["act"], state["zone_index"], 0,
+            *(encode_text(state[name], size) for name, size in TEXT_FIELD_SIZES.items()))
+        self._sequence += 1
+        SEQUENCE.pack_into(self._map, SEQUENCE_OFFSET, self._sequence)
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.flush()
+                self._map.close()
+                self._map = None
@@ -0,0 +1,110 @@
+# Reader for the shared state file the app publishes (setting "shared_state_file").
+# Standalone on purpose - copy this file into other tools; it only needs the standard library.
+#
+# Layout (little-endian, 256 bytes):
+#   0   8s  magic b"POE2STAT"
+#   8   u32 layout version (1)
+#   12  u32 file size
+#   16  u64 sequence - odd while the app is writing, +2 per update
+#   24  i64 log offset (bytes of Client.txt processed)
+#   32  f64 updated at (unix time)
+#   40  f64 zone order (folder prefix, e.g. 2.5; NaN if unknown)
+#   48  i32 level (0 if unknown)
+#   52  i32 act (0 if unknown)
+#   56  i32 zone index in campaign order (-1 if unknown)
+#   60  i32 reserved
+#   64  64s zone name, UTF-8, NUL padded
+#   128 48s flask id, UTF-8, NUL padded
+#   176 48s weapon id, UTF-8, NUL padded
+#
+# Seqlock protocol: read the sequence, skip if odd, copy the payload, read the
+# sequence again - the copy is consistent if both reads match.
+import math
+import mmap
+import struct
+import time
+
+MAGIC = b"POE2STAT"
+LAYOUT_VERSION = 1
+FILE_SIZE = 256
+HEADER = struct.Struct('<8sII')
+SEQUENCE = struct.Struct('<Q')
+SEQUENCE_OFFSET = 16
+PAYLOAD = struct.Struct('<qddiiii64s48s48s')
+PAYLOAD_OFFSET = 24
+FIELDS = ('log_offset', 'updated_at', 'zone_order', 'level', 'act', 'zone_index', '_reserved',
+          'zone', 'flask_id', 'weapon_id')
+TEXT_FIELD_SIZES = {'zone': 64, 'flask_id': 48, 'weapon_id': 48}
+
+def decode_payload(values):
+    """Payload tuple -> dict, with empty/unknown values as None"""
+    state = dict(zip(FIELDS, values))
+    del state['_reserved']
+    for name in TEXT_FIELD_SIZES:
+        state[name] = state[name].split(b'\0', 1)[0].decode('utf-8', errors='replace') or None
+    if math.isnan(state['zone_order']):
+        state['zone_order'] = None
+    state['level'] = state['level'] or None
+    state['act'] = state['act'] or None
+    if state['zone_index'] < 0:
+        state['zone_index'] = None
+    return state
+
+class SharedStateReader:
+    """Maps the state file once; every read after that is a memory copy"""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), FILE_SIZE, access=mmap.ACCESS_READ)
+        magic, version, size = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {LAYOUT_VERSION} state file")
+
+    def sequence(self):
+        return SEQUENCE.unpack_from(self._map, SEQUENCE_OFFSET)[0]
+
+    def read(self, retries=1000):
+        """Consistent snapshot as a dict (with 'sequence'), or None if the writer never let go"""
+        for _ in range(retries):
+            before = self.sequence()
+            if not before & 1:
+                values = PAYLOAD.unpack_from(self._map, PAYLOAD_OFFSET)
+                if self.sequence() == before:
+                    state = decode_payload(values)
+                    state['sequence'] = before // 2
+                    return state
+            # Mid-write: give the writer a moment to finish
+            time.sleep(0)
+        return None
+
+    def wait_for_update(self, last_sequence, timeout=None, interval=0.01):
+        """Poll memory until the sequence moves past last_sequence; returns the new state or None"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            if self.sequence() // 2 != last_sequence:
+                state = self.read()
+                if state is not None:
+                    return state
+            time.sleep(interval)
+        return None
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+def main():
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 else "shared_state.bin"
+    reader = SharedStateReader(path)
+    state = reader.read()
+    print(state)
+    try:
+        while True:
+            state = reader.wait_for_update(state['sequence'] if state else -1)
+            print(state)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
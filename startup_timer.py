@@ -0,0 +1,20 @@
+import time
+
+# Taken at first import, as close to process start as we can get without a launcher
+PROCESS_START = time.perf_counter()
+
+class StartupTimer:
+    """Record how long each startup phase takes, relative to process start"""
+
+    def __init__(self, start=PROCESS_START):
+        self.start = start
+        self.phases = []
+        self._last = start
+
+    def mark(self, phase):
+        """Close the current phase under the given name"""
+        now = time.perf_counter()
+        duration = now - self._last
+        self.phases.append((phase, duration, now - self.start))
+        self._last = now
+        print(f"[startup] {phase}: {duration * 1000:.1f} ms (at {(now - self.start) * 1000:.1f} ms)")
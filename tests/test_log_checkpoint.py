@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_utils import checkpoint_is_valid, get_file_identity, is_same_file
+from tracker_engine import TrackerEngine
+
+def zone_line(clock, zone):
+    return f"2025/01/01 12:{clock:02d}:00 1 abcd [DEBUG Client 1] [SCENE] Set Source [{zone}]\n"
+
+class LogCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, "Client.txt")
+        self.write(zone_line(0, "Clearfell"))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, text, mode="w"):
+        with open(self.log_path, mode, encoding="utf-8", newline="\n") as f:
+            f.write(text)
+
+    def replace_log(self, text):
+        # A new file at the same path, as when the game recreates its log
+        replacement = self.log_path + ".new"
+        with open(replacement, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+        os.replace(replacement, self.log_path)
+
+    def synced_engine(self, checkpoint=None):
+        engine = TrackerEngine(self.log_path)
+        engine.sync(checkpoint)
+        return engine
+
+    def test_resumes_from_checkpoint_and_reads_what_was_missed(self):
+        checkpoint = self.synced_engine().checkpoint()
+        self.write(zone_line(1, "Mud Burrow"), "a")
+        engine = TrackerEngine(self.log_path)
+        self.assertTrue(engine.sync(checkpoint))
+        self.assertEqual(engine.zone, "Clearfell")
+        engine.poll()
+        self.assertEqual(engine.zone, "Mud Burrow")
+
+    def test_checkpoint_for_a_replaced_log_is_ignored(self):
+        checkpoint = self.synced_engine().checkpoint()
+        self.replace_log(zone_line(5, "The Grelwood") + zone_line(6, "Vastiri Outskirts"))
+        self.assertFalse(is_same_file(self.log_path, checkpoint["identity"]))
+        self.assertFalse(checkpoint_is_valid(checkpoint, self.log_path))
+        engine = TrackerEngine(self.log_path)
+        self.assertFalse(engine.sync(checkpoint))
+        # Found by scanning the new file instead
+        self.assertEqual(engine.zone, "Vastiri Outskirts")
+
+    def test_checkpoint_checks_path_and_size(self):
+        checkpoint = self.synced_engine().checkpoint()
+        self.assertTrue(checkpoint_is_valid(checkpoint, self.log_path))
+        self.assertFalse(checkpoint_is_valid(checkpoint, self.log_path + ".other"))
+        self.assertFalse(checkpoint_is_valid(dict(checkpoint, offset=checkpoint["offset"] + 1), self.log_path))
+        self.assertFalse(checkpoint_is_valid(None, self.log_path))
+
+    def test_truncated_log_is_resynced(self):
+        engine = self.synced_engine()
+        self.write(zone_line(1, "Mud Burrow") * 5, "a")
+        engine.poll()
+        self.write(zone_line(2, "The Grelwood"))
+        engine.poll()
+        self.assertEqual(engine.zone, "The Grelwood")
+        self.assertEqual(engine.file_size, os.path.getsize(self.log_path))
+        self.write(zone_line(3, "Clearfell"), "a")
+        engine.poll()
+        self.assertEqual(engine.zone, "Clearfell")
+
+    def test_replaced_log_is_resynced(self):
+        engine = self.synced_engine()
+        self.replace_log(zone_line(4, "Vastiri Outskirts") * 3)
+        engine.poll()
+        self.assertEqual(engine.zone, "Vastiri Outskirts")
+        self.assertEqual(engine.identity, get_file_identity(self.log_path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_utils import LogTailReader
+
+class LogTailReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, "Client.txt")
+        open(self.log_path, "wb").close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def append(self, data):
+        with open(self.log_path, "ab") as f:
+            f.write(data)
+
+    def test_only_new_complete_lines_are_returned(self):
+        reader = LogTailReader(self.log_path)
+        self.append(b"first\nsecond\nthi")
+        self.assertEqual(reader.read_new_lines(), ["first", "second"])
+        self.assertEqual(reader.read_new_lines(), [])
+        self.append(b"rd\n")
+        self.assertEqual(reader.read_new_lines(), ["third"])
+
+    def test_character_split_across_reads(self):
+        reader = LogTailReader(self.log_path)
+        line = "Set Source [Mörkö]\n".encode("utf-8")
+        split = line.index("ö".encode("utf-8")) + 1
+        self.append(line[:split])
+        self.assertEqual(reader.read_new_lines(), [])
+        self.append(line[split:])
+        self.assertEqual(reader.read_new_lines(), ["Set Source [Mörkö]"])
+
+    def test_line_offset_stops_before_held_back_bytes(self):
+        reader = LogTailReader(self.log_path)
+        self.append(b"done\n" + "pä".encode("utf-8")[:2])
+        reader.read_new_lines()
+        self.assertEqual(reader.offset, 7)
+        # A resume from line_offset re-reads the unfinished line from its start
+        self.assertEqual(reader.line_offset, 5)
+
+    def test_max_bytes_reads_in_pieces(self):
+        self.append("zone ä\n".encode("utf-8") * 50)
+        reader = LogTailReader(self.log_path)
+        lines = []
+        while reader.offset < os.path.getsize(self.log_path):
+            lines += reader.read_new_lines(max_bytes=7)
+        self.assertEqual(lines, ["zone ä"] * 50)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_utils import scan_latest_events
+
+ZONE = "2025/01/01 12:00:00 1 abcd [DEBUG Client 1] [SCENE] Set Source [{zone}]\n"
+LEVEL = "2025/01/01 12:00:00 1 abcd [INFO Client 1] : Newbie (Ranger) is now level {level}\n"
+NOISE = "2025/01/01 12:00:00 1 abcd [DEBUG Client 1] nothing to see here\n"
+
+class ScanLatestEventsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, "Client.txt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, text):
+        with open(self.log_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+
+    def latest(self, **options):
+        zone, level = scan_latest_events(self.log_path, **options)
+        return zone.zone if zone else None, level.level if level else None
+
+    def test_latest_of_each_event(self):
+        self.write(ZONE.format(zone="Clearfell") + LEVEL.format(level=2) + NOISE * 100 +
+                   ZONE.format(zone="Mud Burrow") + NOISE * 100)
+        self.assertEqual(self.latest(), ("Mud Burrow", 2))
+
+    def test_event_lines_across_every_block_boundary(self):
+        # Small blocks put each boundary somewhere inside the event lines
+        text = LEVEL.format(level=7) + NOISE * 3 + ZONE.format(zone="The Grelwood") + NOISE * 3
+        self.write(text)
+        for block_size in range(8, 120):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(self.latest(block_size=block_size), ("The Grelwood", 7))
+
+    def test_multibyte_zone_name_across_a_block_boundary(self):
+        self.write(ZONE.format(zone="Mörkö") + NOISE)
+        for block_size in range(8, 80):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(self.latest(block_size=block_size), ("Mörkö", None))
+
+    def test_end_offset_ignores_later_bytes(self):
+        first = ZONE.format(zone="Clearfell")
+        self.write(first + ZONE.format(zone="Mud Burrow"))
+        self.assertEqual(self.latest(end_offset=len(first.encode("utf-8"))), ("Clearfell", None))
+
+    def test_empty_log(self):
+        self.write("")
+        self.assertEqual(self.latest(), (None, None))
+
+if __name__ == "__main__":
+    unittest.main()
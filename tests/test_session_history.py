@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_history import SessionHistory
+from tracker_engine import TrackerEngine
+
+ACTS = {"Clearfell": 1, "Mud Burrow": 1, "The Grelwood": 1, "Vastiri Outskirts": 2}
+
+def zone_line(clock, zone):
+    return f"2025/01/01 12:{clock:02d}:00 1 abcd [DEBUG Client 1] [SCENE] Set Source [{zone}]"
+
+def level_line(clock, character, level):
+    return f"2025/01/01 12:{clock:02d}:00 1 abcd [INFO Client 1] : {character} (Ranger) is now level {level}"
+
+def opened_line(clock):
+    return f"2025/01/01 12:{clock:02d}:00 ***** LOG FILE OPENING *****"
+
+class SessionHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.directory.name, "Client.txt")
+        self.history = SessionHistory(os.path.join(self.directory.name, "history.db"), act_lookup=ACTS.get)
+
+    def tearDown(self):
+        self.history.close()
+        self.directory.cleanup()
+
+    def replay(self, lines):
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        engine = TrackerEngine(self.log_path)
+        engine.add_listener(self.history.on_change)
+        engine.replay()
+        self.history.flush()
+
+    def test_zones_before_first_level_up_belong_to_that_character(self):
+        # An earlier character in the same history must not claim the new one's first zones
+        self.replay([zone_line(0, "Vastiri Outskirts"), level_line(1, "Veteran", 40)])
+        self.replay([
+            opened_line(9),
+            zone_line(10, "Clearfell"),
+            zone_line(12, "Mud Burrow"),
+            level_line(13, "Newbie", 2),
+            zone_line(15, "The Grelwood"),
+            level_line(16, "Newbie", 3),
+            zone_line(20, "Vastiri Outskirts"),
+            level_line(21, "Newbie", 4),
+        ])
+
+        boundaries = self.history.act_boundaries("Newbie")
+        self.assertEqual([(row["act"], row["zone"], row["level"]) for row in boundaries],
+                         [(1, "Clearfell", 1), (2, "Vastiri Outskirts", 3)])
+        zones = {row["zone"]: row["seconds"] for row in self.history.zone_times("Newbie")}
+        # The zone still being played has no end yet
+        self.assertEqual(zones, {"Clearfell": 120, "Mud Burrow": 180, "The Grelwood": 300, "Vastiri Outskirts": 0})
+        self.assertEqual([row["zone"] for row in self.history.zone_times("Veteran")], ["Vastiri Outskirts"])
+
+    def test_zones_after_a_level_up_are_credited_right_away(self):
+        self.replay([
+            level_line(0, "Newbie", 2),
+            zone_line(1, "Clearfell"),
+            level_line(2, "Newbie", 3),
+            # Entered in the level-up's second, after it
+            zone_line(2, "Mud Burrow"),
+        ])
+        rows = self.history.timeline("Newbie")
+        self.assertEqual([(row["kind"], row["zone"], row["level"]) for row in rows], [
+            ("level", None, 2), ("zone", "Clearfell", 2), ("level", "Clearfell", 3), ("zone", "Mud Burrow", 3)])
+        self.assertEqual([row for row in self.history.timeline(None) if row["kind"] == "zone"], [])
+
+    def test_a_new_session_does_not_claim_the_previous_one(self):
+        self.replay([
+            zone_line(0, "Vastiri Outskirts"),
+            level_line(1, "Veteran", 40),
+            zone_line(2, "Clearfell"),
+            opened_line(5),
+            zone_line(6, "Mud Burrow"),
+        ])
+        self.assertEqual([row["zone"] for row in self.history.zone_times("Veteran")],
+                         ["Vastiri Outskirts", "Clearfell"])
+        # Nobody has levelled up in the new session yet
+        self.assertEqual([row["zone"] for row in self.history.timeline(None) if row["kind"] == "zone"],
+                         ["Mud Burrow"])
+        self.replay([level_line(7, "Newbie", 2)])
+        self.assertEqual([(row["kind"], row["zone"], row["level"]) for row in self.history.timeline("Newbie")],
+                         [("zone", "Mud Burrow", 1), ("level", "Mud Burrow", 2)])
+
+    def test_replaying_a_log_again_adds_nothing(self):
+        lines = [zone_line(0, "Clearfell"), level_line(1, "Newbie", 2), zone_line(2, "Mud Burrow")]
+        self.replay(lines)
+        written = self.history.rows_written
+        engine = TrackerEngine(self.log_path)
+        engine.add_listener(self.history.on_change)
+        engine.replay()
+        self.history.flush()
+        self.assertEqual(self.history.rows_written, written)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_state import SharedStateWriter
+from shared_state_reader import SharedStateReader, SEQUENCE, SEQUENCE_OFFSET
+
+class SharedStateTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "shared_state.bin")
+        self.writer = SharedStateWriter(self.path)
+        self.reader = SharedStateReader(self.path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.writer.close()
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        self.writer.update(zone="Clearfell", level=3, act=1, zone_order=1.5, zone_index=2, flask_id="life-1")
+        state = self.reader.read()
+        self.assertEqual((state["zone"], state["level"], state["act"], state["zone_order"], state["zone_index"]),
+                         ("Clearfell", 3, 1, 1.5, 2))
+        self.assertEqual(state["flask_id"], "life-1")
+        self.assertIsNone(state["weapon_id"])
+        self.writer.update(zone=None, zone_order=None)
+        state = self.reader.read()
+        self.assertIsNone(state["zone"])
+        self.assertIsNone(state["zone_order"])
+
+    def test_unchanged_update_keeps_the_sequence(self):
+        self.writer.update(level=5)
+        sequence = self.reader.read()["sequence"]
+        self.assertFalse(self.writer.update(level=5))
+        self.assertEqual(self.reader.read()["sequence"], sequence)
+
+    def test_no_snapshot_while_the_writer_is_mid_update(self):
+        # An odd sequence means the payload is being rewritten
+        SEQUENCE.pack_into(self.writer._map, SEQUENCE_OFFSET, self.writer._sequence + 1)
+        self.assertIsNone(self.reader.read(retries=3))
+        SEQUENCE.pack_into(self.writer._map, SEQUENCE_OFFSET, self.writer._sequence)
+        self.assertIsNotNone(self.reader.read(retries=3))
+
+    def test_read_overlapping_an_update_is_retried(self):
+        self.writer.update(level=1, act=1)
+        before = self.reader.read()["sequence"]
+        sequence = self.reader.sequence
+        calls = []
+
+        def sequence_with_update_in_between():
+            value = sequence()
+            calls.append(value)
+            if len(calls) == 1:
+                # The writer runs between the reader's first sequence read and its copy
+                self.writer.update(level=2, act=2)
+            return value
+
+        self.reader.sequence = sequence_with_update_in_between
+        state = self.reader.read()
+        # The first copy didn't match its sequence, so it was thrown away
+        self.assertEqual(len(calls), 4)
+        self.assertEqual((state["level"], state["act"], state["sequence"]), (2, 2, before + 1))
+
+    def test_concurrent_updates_read_consistently(self):
+        # Every update keeps level, act and zone in step, so a torn read would show a mismatch
+        stop = threading.Event()
+
+        def write():
+            value = 0
+            while not stop.is_set():
+                value = value % 1000 + 1
+                self.writer.update(level=value, act=value, zone=f"zone-{value}" * 4, log_offset=value)
+
+        thread = threading.Thread(target=write)
+        thread.start()
+        try:
+            reads = 0
+            while reads < 2000:
+                state = self.reader.read()
+                if state is None or state["level"] is None:
+                    continue
+                reads += 1
+                self.assertEqual(state["act"], state["level"])
+                self.assertEqual(state["log_offset"], state["level"])
+                self.assertEqual(state["zone"], f"zone-{state['level']}" * 4)
+        finally:
+            stop.set()
+            thread.join()
+
+if __name__ == "__main__":
+    unittest.main()
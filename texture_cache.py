@@ -0,0 +1,148 @@
+import threading
+from collections import OrderedDict
+import dearpygui.dearpygui as dpg
+from path_utils import ensure_resource_file
+
+# dpg.load_image returns RGBA as 32-bit floats
+BYTES_PER_PIXEL = 16
+
+class TextureCache:
+    """LRU cache of map textures keyed by image path, bounded by a byte budget.
+
+    Evicted textures are deleted from the dpg texture registry so texture
+    memory stays bounded. Pinned paths (the maps currently on screen) are
+    never evicted, since deleting a texture an image widget still uses
+    would break the display.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.prefetched = 0
+        self._entries = OrderedDict()
+        self._pinned = set()
+        self._lock = threading.RLock()
+
+    def get(self, image_path):
+        """Return texture info for image_path, decoding and uploading it on a miss"""
+        with self._lock:
+            entry = self._entries.get(image_path)
+            if entry is not None:
+                self._entries.move_to_end(image_path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        return self._insert(image_path, self._load(image_path))
+
+    def prefetch(self, image_path, dispatch=None):
+        """Load image_path ahead of time without counting it as a hit or miss.
+
+        Decoding happens on the calling thread. If dispatch is given, the
+        texture upload is handed to it (dispatch(key, callback)) so it runs
+        on the UI thread.
+        """
+        with self._lock:
+            if image_path in self._entries:
+                return
+        decoded = self._decode(image_path)
+        if decoded is None:
+            return
+
+        def upload():
+            if self._insert(image_path, self._upload(image_path, decoded)) is not None:
+                self.prefetched += 1
+
+        if dispatch is None:
+            upload()
+        else:
+            dispatch(f"texture:{image_path}", upload)
+
+    def _insert(self, image_path, entry):
+        if entry is None:
+            return None
+        with self._lock:
+            existing = self._entries.get(image_path)
+            if existing is not None:
+                # Another thread loaded it meanwhile - keep theirs, drop ours
+                dpg.delete_item(entry['texture'])
+                return existing
+            self._entries[image_path] = entry
+            self.total_bytes += entry['bytes']
+            self._evict_to_budget()
+        return entry
+
+    def __contains__(self, image_path):
+        with self._lock:
+            return image_path in self._entries
+
+    def _load(self, image_path):
+        decoded = self._decode(image_path)
+        return self._upload(image_path, decoded) if decoded is not None else None
+
+    def _decode(self, image_path):
+        """Decode pixels (no dpg state touched, so safe on any thread)"""
+        try:
+            width, height, channels, data = dpg.load_image(ensure_resource_file(image_path))
+            return (width, height, data) if data is not None else None
+        except Exception as e:
+            print(f"Error loading map image {image_path}: {e}")
+            return None
+
+    def _upload(self, image_path, decoded):
+        width, height, data = decoded
+        try:
+            with dpg.texture_registry():
+                texture_id = dpg.add_static_texture(width, height, data)
+        except Exception as e:
+            print(f"Error creating texture for {image_path}: {e}")
+            return None
+        return {
+            'texture': texture_id,
+            'width': width,
+            'height': height,
+            'path': image_path,
+            'bytes': width * height * BYTES_PER_PIXEL
+        }
+
+    def pin(self, image_paths):
+        """Protect exactly these paths from eviction (replaces the previous pin set).
+
+        Safe on any thread: nothing is deleted here, textures that are no
+        longer pinned are evicted by the next insert (on the UI thread).
+        """
+        with self._lock:
+            self._pinned = set(image_paths)
+
+    def pinned_bytes(self):
+        """Texture memory held by the pinned (on-screen) maps"""
+        with self._lock:
+            return sum(entry['bytes'] for path, entry in self._entries.items() if path in self._pinned)
+
+    def _evict_to_budget(self):
+        for path in list(self._entries):
+            if self.total_bytes <= self.budget_bytes:
+                break
+            if path in self._pinned:
+                continue
+            entry = self._entries.pop(path)
+            self.total_bytes -= entry['bytes']
+            self.evictions += 1
+            if dpg.does_item_exist(entry['texture']):
+                dpg.delete_item(entry['texture'])
+
+    def stats(self):
+        """Counters for hit rate and memory use"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'prefetched': self.prefetched,
+                'textures': len(self._entries),
+                'bytes': self.total_bytes,
+                'budget_bytes': self.budget_bytes
+            }
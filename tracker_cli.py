@@ -0,0 +1,190 @@
+# Headless zone/level tracking from the command line, e.g.
+#   python tracker_cli.py replay Client.txt --speed 60 --weapon-type Bow
+#   python tracker_cli.py follow Client.txt Other/Client.txt
+#   python tracker_cli.py state Client.txt
+#   python tracker_cli.py serve Client.txt --port 8765
+#   python tracker_cli.py replay Client.txt --history session_history.db
+#   python tracker_cli.py history --db session_history.db
+#   python tracker_cli.py import old/Client.txt.gz old/Client2.txt --history session_history.db
+# Timeline records go to stdout as JSON lines; progress and statistics go to stderr.
+import argparse
+import contextlib
+import json
+import sys
+import time
+from tracker_engine import TrackerEngine
+from tracker_reactor import TrackerReactor
+from metrics import get_metrics
+
+def timeline_writer(out):
+    """Tracker listener that writes one JSON line per zone/level change"""
+    def write(engine, changed, event):
+        record = {"log": engine.log_path, "timestamp": event.timestamp, "changed": list(changed)}
+        record.update(engine.snapshot())
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+    return write
+
+def open_history(path):
+    """SessionHistory at path with acts from the zone manifest, or None without a path"""
+    if not path:
+        return None
+    from session_history import SessionHistory
+    from zone_manifest import ZoneManifest
+    return SessionHistory(path, act_lookup=ZoneManifest.build("data/maps").act_of)
+
+def cmd_replay(args, out):
+    engine = TrackerEngine(args.log_path, args.weapon_type)
+    engine.add_listener(timeline_writer(out))
+    history = open_history(args.history)
+    if history:
+        engine.add_listener(history.on_change)
+    try:
+        stats = engine.replay(speed=args.speed)
+    finally:
+        if history:
+            history.close()
+            print(f"Recorded {history.rows_written} new events in {args.history}")
+    print(f"Replayed {stats['lines']} lines ({stats['bytes'] / (1024 * 1024):.1f} MB), {stats['events']} events "
+          f"in {stats['seconds']:.2f}s - {stats['mb_per_second']:.1f} MB/s, {stats['lines_per_second']:.0f} lines/sec")
+
+def cmd_import(args, out):
+    from bulk_import import bulk_import
+    history = open_history(args.history)
+    try:
+        for log_path in [args.log_path] + args.more_logs:
+            engine = TrackerEngine(log_path, args.weapon_type)
+            if not args.quiet:
+                engine.add_listener(timeline_writer(out))
+            if history:
+                engine.add_listener(history.on_change)
+            stats = bulk_import(log_path, engine.apply_events, workers=args.workers,
+                                chunk_bytes=int(args.chunk_mb * 1024 * 1024))
+            print(f"Imported {log_path}: {stats['lines']} lines ({stats['bytes'] / (1024 * 1024):.1f} MB"
+                  f"{', gzip' if stats['gzip'] else ''}), {stats['events']} events in {stats['seconds']:.2f}s "
+                  f"with {stats['workers']} workers - {stats['mb_per_second']:.1f} MB/s")
+    finally:
+        if history:
+            history.close()
+            print(f"Recorded {history.rows_written} new events in {args.history}")
+
+def cmd_follow(args, out):
+    # Every log is followed from one reactor thread
+    reactor = TrackerReactor()
+    history = open_history(args.history)
+    for log_path in [args.log_path] + args.more_logs:
+        engine = TrackerEngine(log_path, args.weapon_type)
+        engine.add_listener(timeline_writer(out))
+        if history:
+            engine.add_listener(history.on_change)
+        engine.sync()
+        reactor.add(engine)
+    reactor.start()
+    try:
+        while reactor.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reactor.stop()
+        if history:
+            history.close()
+
+def cmd_state(args, out):
+    engine = TrackerEngine(args.log_path, args.weapon_type)
+    engine.sync()
+    out.write(json.dumps(engine.snapshot()) + "\n")
+
+def cmd_serve(args, out):
+    # Only the serve command needs the maps and the server
+    from image_pyramid import ImagePyramid
+    from overlay_server import OverlayServer, build_overlay_state
+    from zone_manifest import ZoneManifest
+    manifest = ZoneManifest.build("data/maps")
+    pyramid = ImagePyramid(args.map_cache_dir)
+    server = OverlayServer(args.host, args.port, manifest, select_source=pyramid.select).start()
+
+    engine = TrackerEngine(args.log_path, args.weapon_type)
+    def publish(engine, changed=None, event=None):
+        server.publish(build_overlay_state(engine.zone, engine.level, engine.weapon_type, manifest))
+    engine.add_listener(publish)
+    engine.add_listener(timeline_writer(out))
+    engine.sync()
+    publish(engine)
+    try:
+        engine.follow(lambda: True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Overlay server stats: {server.stats()}")
+        server.stop()
+
+def cmd_history(args, out):
+    from session_history import SessionHistory
+    history = SessionHistory(args.db)
+    try:
+        character = args.character or history.last_character()
+        report = {
+            "character": character,
+            "act_boundaries": history.act_boundaries(character),
+            "zone_times": history.zone_times(character)
+        }
+        out.write(json.dumps(report, indent=2) + "\n")
+    finally:
+        history.close()
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Track PoE2 zone/level from Client.txt without the GUI")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    replay = subcommands.add_parser("replay", help="replay a whole log and print the zone/level timeline")
+    replay.add_argument("--speed", type=float, default=0,
+                        help="0 = as fast as possible (default), 1 = real time, 60 = a minute per second")
+    replay.set_defaults(func=cmd_replay)
+
+    import_logs = subcommands.add_parser("import", help="parse whole (or gzip-compressed) logs on all cores")
+    import_logs.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    import_logs.add_argument("--chunk-mb", type=float, default=16, help="size of the chunks handed to workers")
+    import_logs.add_argument("--quiet", action="store_true", help="don't print the timeline")
+    import_logs.set_defaults(func=cmd_import)
+
+    follow = subcommands.add_parser("follow", help="print zone/level changes as the logs are written")
+    follow.set_defaults(func=cmd_follow)
+
+    state = subcommands.add_parser("state", help="print the current zone/level and recommendations")
+    state.set_defaults(func=cmd_state)
+
+    serve = subcommands.add_parser("serve", help="follow the log and serve overlays over HTTP/WebSocket")
+    serve.add_argument("--host", default="127.0.0.1", help="use 0.0.0.0 to serve other machines on the LAN")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--map-cache-dir", default="map_cache", help="image pyramid to resize maps from")
+    serve.set_defaults(func=cmd_serve)
+
+    history = subcommands.add_parser("history", help="time per zone and level at each act from a session history")
+    history.add_argument("--db", default="session_history.db", help="history database (setting history_file)")
+    history.add_argument("--character", help="defaults to the most recently seen character")
+    history.set_defaults(func=cmd_history)
+
+    for subcommand in (replay, import_logs, follow):
+        subcommand.add_argument("--history", help="also record zone/level changes in this SQLite history")
+    for subcommand in (replay, import_logs, follow, state, serve):
+        subcommand.add_argument("log_path", help="path to Client.txt")
+        subcommand.add_argument("--weapon-type", default="", help="weapon category to recommend, e.g. Bow")
+        subcommand.add_argument("--metrics", help="write a JSON metrics snapshot here when done")
+    follow.add_argument("more_logs", nargs="*", help="more Client.txt files to follow at the same time")
+    import_logs.add_argument("more_logs", nargs="*", help="more logs to import, in order")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    out = sys.stdout
+    # The engine reports progress with print - keep it out of the JSON stream
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            args.func(args, out)
+        finally:
+            if getattr(args, "metrics", None):
+                print(f"Metrics written to {get_metrics().dump(args.metrics)}")
+
+if __name__ == "__main__":
+    main()
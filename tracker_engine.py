@@ -0,0 +1,240 @@
+import os
+import time
+from log_utils import (LogTailReader, scan_latest_events, get_file_identity, is_same_file,
+                       checkpoint_is_valid)
+from log_parser import LogParser, ZoneEntered, LevelUp, LogOpened
+from log_watcher import create_watcher
+from recommendation_engine import get_engine
+from weapon_utils import get_best_weapon_for_level
+from metrics import get_metrics, SIZE_BUCKETS_BYTES
+
+# Largest backlog of unread log bytes we'll replay when resuming from a checkpoint
+MAX_CHECKPOINT_CATCHUP_BYTES = 8 * 1024 * 1024
+FLASK_CATEGORY = "Life Flask"
+
+def parse_log_timestamp(timestamp):
+    """Seconds since the epoch for a 'YYYY/MM/DD HH:MM:SS' log timestamp, or None"""
+    if not timestamp:
+        return None
+    try:
+        return time.mktime(time.strptime(timestamp, "%Y/%m/%d %H:%M:%S"))
+    except ValueError:
+        return None
+
+def item_summary(item):
+    """Id, name and required level of an item table entry (None stays None)"""
+    if not item:
+        return None
+    return {"id": item.get("id"), "name": item.get("name"), "requiredLevel": item.get("requiredLevel")}
+
+def recommend(level, weapon_type="", stats=None):
+    """Best flask and (highest-DPS) weapon for a level, as plain dicts"""
+    return {
+        "flask": item_summary(get_engine().best_for_level(FLASK_CATEGORY, level)),
+        "weapon": item_summary(get_best_weapon_for_level(level, weapon_type, stats))
+    }
+
+class TrackerEngine:
+    """Zone/level tracking for one Client.txt, with no UI attached.
+
+    Owns the tail reader, parser and file identity for the log. Every zone
+    or level change is reported to listeners as callback(engine, changed,
+    event), where changed is a tuple of "zone"/"level" (or "session" when
+    the game starts and reopens the log). The GUI, the CLI and the
+    benchmarks all drive the same engine.
+    """
+
+    def __init__(self, log_path, weapon_type=""):
+        self.log_path = log_path
+        self.weapon_type = weapon_type
+        self.zone = None
+        self.level = None
+        self.parser = LogParser()
+        self.reader = None
+        self.identity = None
+        self.file_size = 0
+        self.watcher = None
+        self._listeners = []
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def apply_events(self, events):
+        """Update state from events in log order; returns the (changed, event) pairs"""
+        changes = []
+        for event in events:
+            if isinstance(event, ZoneEntered):
+                if not event.zone or event.zone == self.zone:
+                    continue
+                self.zone = event.zone
+                changed = ("zone",)
+            elif isinstance(event, LevelUp):
+                if event.level == self.level:
+                    continue
+                self.level = event.level
+                changed = ("level",)
+            elif isinstance(event, LogOpened):
+                changed = ("session",)
+            else:
+                continue
+            changes.append((changed, event))
+            get_metrics().counter(f"log.{changed[0]}_changes").inc()
+            for callback in self._listeners:
+                try:
+                    callback(self, changed, event)
+                except Exception as e:
+                    print(f"Error in tracker listener: {e}")
+        return changes
+
+    def open(self, offset):
+        """Start reading the log at offset"""
+        self.file_size = offset
+        self.identity = get_file_identity(self.log_path) if os.path.exists(self.log_path) else None
+        self.reader = LogTailReader(self.log_path, offset)
+
+    def sync(self, checkpoint=None):
+        """Start tracking the log and restore the current zone/level.
+
+        Resumes from checkpoint if it is for this file and the unread gap is
+        small; otherwise starts at the end of the log and scans backwards.
+        Returns True if the checkpoint was used.
+        """
+        if checkpoint_is_valid(checkpoint, self.log_path) and \
+                os.path.getsize(self.log_path) - checkpoint["offset"] <= MAX_CHECKPOINT_CATCHUP_BYTES:
+            self.open(checkpoint["offset"])
+            self.identity = checkpoint["identity"]
+            print(f"Resuming log monitoring from checkpoint at byte {self.file_size}")
+            events = []
+            if checkpoint.get("zone"):
+                events.append(ZoneEntered(checkpoint["zone"], None))
+            if checkpoint.get("level") is not None:
+                events.append(LevelUp(None, None, checkpoint["level"], None))
+            self.apply_events(events)
+            return True
+
+        self.open(os.path.getsize(self.log_path) if os.path.exists(self.log_path) else 0)
+        self.detect_current_state()
+        return False
+
+    def detect_current_state(self):
+        """Detect the latest zone and level by scanning the log backwards from EOF"""
+        try:
+            if not os.path.exists(self.log_path):
+                return
+            start = time.perf_counter()
+            # Only look at what existed when tracking started - the tail reader covers the rest
+            latest = scan_latest_events(self.log_path, end_offset=self.file_size)
+            print(f"Scanned log for current zone/level in {(time.perf_counter() - start) * 1000:.1f} ms")
+            self.apply_events([event for event in latest if event is not None])
+        except Exception as e:
+            print(f"Error detecting current zone/level: {e}")
+
+    def poll(self):
+        """Process whatever was appended since the last poll; returns the changes"""
+        if not os.path.exists(self.log_path):
+            return []
+        current_size = os.path.getsize(self.log_path)
+        if current_size < self.file_size or not is_same_file(self.log_path, self.identity):
+            # Truncated or replaced - our offset means nothing for this file
+            print("Log file was truncated or replaced - re-syncing")
+            self.sync()
+            return []
+        if current_size == self.file_size:
+            return []
+        self.file_size = current_size
+        metrics = get_metrics()
+        with metrics.timer("log.tick_ms"):
+            # Only read the bytes appended since the last poll
+            start_offset = self.reader.offset
+            lines = self.reader.read_new_lines()
+            bytes_read = self.reader.offset - start_offset
+            metrics.histogram("log.tick_bytes", SIZE_BUCKETS_BYTES).observe(bytes_read)
+            metrics.counter("log.bytes_read").inc(bytes_read)
+            metrics.counter("log.lines_read").inc(len(lines))
+            with metrics.timer("log.parse_ms"):
+                events = self.parser.parse(lines)
+        return self.apply_events(events)
+
+    def follow(self, is_running, on_poll=None, timeout=5.0, watcher=None):
+        """Poll on every log change until is_running() is False (blocks; run it on a thread).
+
+        watcher defaults to the best one for this platform (see create_watcher).
+        """
+        self.watcher = watcher or create_watcher(self.log_path)
+        print(f"Watching log with {type(self.watcher).__name__}")
+        try:
+            while is_running():
+                try:
+                    changes = self.poll()
+                    if on_poll:
+                        on_poll(changes)
+                    # Block until the log changes or wake() is called, re-checking now and then
+                    self.watcher.wait(timeout=timeout)
+                except Exception as e:
+                    print(f"Error monitoring log file: {e}")
+                    time.sleep(5)  # Wait longer if there's an error
+        finally:
+            self.watcher.close()
+
+    def wake(self):
+        """Interrupt follow()'s wait so it re-checks is_running()"""
+        if self.watcher:
+            self.watcher.wake()
+
+    def replay(self, speed=0, chunk_bytes=1024 * 1024):
+        """Feed the whole log through the engine from the start, as if it were being written.
+
+        speed 0 replays as fast as possible; otherwise the gaps between event
+        timestamps are reproduced, divided by speed (1 = real time).
+        Returns throughput statistics.
+        """
+        self.open(0)
+        start = time.perf_counter()
+        first_log_time = None
+        events = 0
+        while True:
+            lines = self.reader.read_new_lines(max_bytes=chunk_bytes)
+            if not lines and self.reader.offset >= os.path.getsize(self.log_path):
+                break
+            for event in self.parser.parse(lines):
+                events += 1
+                log_time = parse_log_timestamp(event.timestamp)
+                if speed > 0 and log_time is not None:
+                    if first_log_time is None:
+                        first_log_time = log_time
+                    delay = (log_time - first_log_time) / speed - (time.perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+                self.apply_events([event])
+        self.file_size = self.reader.offset
+        seconds = time.perf_counter() - start
+        return {
+            "bytes": self.reader.offset,
+            "lines": self.parser.lines_parsed,
+            "events": events,
+            "seconds": seconds,
+            "mb_per_second": self.reader.offset / (1024 * 1024) / seconds if seconds > 0 else 0.0,
+            "lines_per_second": self.parser.lines_parsed / seconds if seconds > 0 else 0.0
+        }
+
+    def checkpoint(self):
+        """Log offset and state to resume from, or None before sync()"""
+        if not self.reader or not self.identity:
+            return None
+        return {
+            "log_path": self.log_path,
+            "identity": self.identity,
+            "offset": self.reader.line_offset,
+            "zone": self.zone,
+            "level": self.level
+        }
+
+    def recommendations(self, level=None):
+        """Best flask/weapon for level (defaults to the detected level)"""
+        return recommend(self.level if level is None else level, self.weapon_type)
+
+    def snapshot(self):
+        """Current state plus recommendations as a JSON-friendly dict"""
+        state = {"zone": self.zone, "level": self.level}
+        state.update(self.recommendations())
+        return state
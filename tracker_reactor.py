@@ -0,0 +1,124 @@
+import threading
+from log_watcher import create_watcher
+
+class TrackerReactor:
+    """Follows any number of TrackerEngines from one thread and one watcher.
+
+    The watcher reports which log files changed, and only those engines
+    are polled. Idle logs cost nothing between the periodic re-check
+    every `timeout` seconds, which also catches anything the watcher missed.
+    on_poll(engine, changes) is called after each engine is polled.
+
+    Engines added before they were synced are synced on the reactor thread
+    too, so a long reverse scan of a big log never blocks the caller.
+    """
+
+    def __init__(self, on_poll=None, timeout=5.0):
+        self.on_poll = on_poll
+        self.timeout = timeout
+        self._engines = {}
+        # log path -> (engine, checkpoint, on_synced) waiting for their first sync
+        self._unsynced = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._thread = None
+        self._running = False
+
+    def add(self, engine, checkpoint=None, on_synced=None):
+        """Track engine's log (replacing an engine already tracking the same path).
+
+        An engine that hasn't been synced is synced from checkpoint (when
+        usable) on the reactor thread before its first poll, then
+        on_synced(engine) is called there.
+        """
+        with self._lock:
+            self._engines[engine.log_path] = engine
+            if engine.reader is None:
+                self._unsynced[engine.log_path] = (engine, checkpoint, on_synced)
+            else:
+                self._unsynced.pop(engine.log_path, None)
+            watcher = self._watcher
+        if watcher:
+            watcher.add(engine.log_path)
+            # Poll the new log right away instead of after the next timeout
+            watcher.wake()
+
+    def remove(self, log_path):
+        with self._lock:
+            engine = self._engines.pop(log_path, None)
+            self._unsynced.pop(log_path, None)
+            watcher = self._watcher
+        if watcher and engine:
+            watcher.remove(log_path)
+        return engine
+
+    def get(self, log_path):
+        with self._lock:
+            return self._engines.get(log_path)
+
+    def engines(self):
+        with self._lock:
+            return list(self._engines.values())
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        with self._lock:
+            self._watcher = create_watcher(list(self._engines))
+        print(f"Watching {len(self._engines)} log(s) with {type(self._watcher).__name__}")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        watcher = self._watcher
+        if watcher:
+            watcher.wake()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _sync_new(self):
+        with self._lock:
+            unsynced, self._unsynced = list(self._unsynced.values()), {}
+        for engine, checkpoint, on_synced in unsynced:
+            try:
+                engine.sync(checkpoint)
+                if on_synced:
+                    on_synced(engine)
+            except Exception as e:
+                print(f"Error syncing log file {engine.log_path}: {e}")
+
+    def _poll(self, engine):
+        try:
+            changes = engine.poll()
+            if self.on_poll:
+                self.on_poll(engine, changes)
+        except Exception as e:
+            print(f"Error monitoring log file {engine.log_path}: {e}")
+
+    def _run(self):
+        watcher = self._watcher
+        try:
+            # Everything is due on the first pass (and after every timeout or wake)
+            changed = None
+            while self._running:
+                self._sync_new()
+                with self._lock:
+                    engines = list(self._engines.values())
+                for engine in engines:
+                    if engine.reader is None:
+                        # Added since _sync_new - synced on the next pass
+                        continue
+                    if changed is None or engine.log_path in changed:
+                        self._poll(engine)
+                changed = watcher.wait_changes(timeout=self.timeout) or None
+        finally:
+            with self._lock:
+                if self._watcher is watcher:
+                    self._watcher = None
+            watcher.close()
@@ -0,0 +1,39 @@
+import threading
+from collections import OrderedDict
+
+class UIDispatchQueue:
+    """Thread-safe queue of UI work, drained once per frame by the render loop.
+
+    Work is posted under a key and a newer post replaces a pending one with
+    the same key, so a burst of zone/level events between two frames
+    becomes a single rebuild that reads the latest state.
+    """
+
+    def __init__(self):
+        self._pending = OrderedDict()
+        self._lock = threading.Lock()
+        self.posted = 0
+        self.coalesced = 0
+        self.executed = 0
+
+    def post(self, key, callback):
+        """Schedule callback() on the UI thread, replacing any pending work with the same key"""
+        with self._lock:
+            self.posted += 1
+            if self._pending.pop(key, None) is not None:
+                self.coalesced += 1
+            self._pending[key] = callback
+
+    def drain(self):
+        """Run everything pending; call from the render loop only"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, OrderedDict()
+        for key, callback in pending.items():
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error running UI update '{key}': {e}")
+        self.executed += len(pending)
+        return len(pending)
@@ -0,0 +1,54 @@
+from metrics import get_metrics
+
+# State each display panel is built from - a panel only rebuilds when one of these changes
+PANEL_INPUTS = {
+    "flask": ("level",),
+    "weapon": ("level", "weapon_type"),
+    "maps": ("zone",),
+    "notes": ("zone",),
+}
+
+class ViewModel:
+    """Remembers what each display panel was last built from.
+
+    stale_panels() compares the current state against each panel's inputs
+    so a level-up only touches flask/weapon and a zone change only touches
+    maps/notes. content_changed() is the second check inside a panel: if
+    the computed content (e.g. the best flask) is the same as what is on
+    screen, the widgets are left alone.
+    """
+
+    def __init__(self, panel_inputs=PANEL_INPUTS):
+        self.panel_inputs = panel_inputs
+        self._inputs = {}
+        self._content = {}
+        self.rebuilds = 0
+        self.skipped = 0
+
+    def stale_panels(self, state):
+        """Panels whose inputs changed since the last call, recording the new inputs"""
+        stale = []
+        for panel, keys in self.panel_inputs.items():
+            inputs = tuple(state.get(key) for key in keys)
+            if panel not in self._inputs or self._inputs[panel] != inputs:
+                self._inputs[panel] = inputs
+                stale.append(panel)
+        return stale
+
+    def content_changed(self, panel, content):
+        """True (and remembered) if content differs from what the panel currently shows"""
+        if panel in self._content and self._content[panel] == content:
+            self.skipped += 1
+            get_metrics().counter(f"panel.{panel}.skipped").inc()
+            return False
+        self._content[panel] = content
+        self.rebuilds += 1
+        get_metrics().counter(f"panel.{panel}.rebuilds").inc()
+        return True
+
+    def invalidate(self, panel=None):
+        """Force a panel (or every panel) to rebuild on its next update"""
+        panels = [panel] if panel else list(self.panel_inputs)
+        for name in panels:
+            self._inputs.pop(name, None)
+            self._content.pop(name, None)
@@ -0,0 +1,121 @@
+import threading
+from recommendation_engine import get_engine, DEFAULT_MAX_LEVEL
+
+DAMAGE_KEYS = ("physicalDamage", "fireDamage", "coldDamage", "lightningDamage", "chaosDamage")
+STAT_KEYS = ("str", "dex", "int")
+# Base critical damage bonus: a crit deals 200% damage
+CRIT_DAMAGE_BONUS = 1.0
+
+def parse_damage_range(text):
+    """'6-9' -> (6.0, 9.0); anything unparsable is (0.0, 0.0)"""
+    try:
+        low, high = str(text).split("-", 1)
+        return float(low), float(high)
+    except (TypeError, ValueError):
+        return 0.0, 0.0
+
+def average_hit(info):
+    """Average damage per hit over every damage type the base has"""
+    return sum(sum(parse_damage_range(info[key])) / 2 for key in DAMAGE_KEYS if key in info)
+
+def weapon_dps(info):
+    """Expected DPS of a weapon base, with crits (no player modifiers)"""
+    crit_chance = min(float(info.get("criticalHitChance", 0)) / 100, 1.0)
+    return average_hit(info) * float(info.get("attacksPerSecond", 0)) * (1 + crit_chance * CRIT_DAMAGE_BONUS)
+
+class WeaponScoreTable:
+    """Numeric columns for every base in a weapon class, parsed once.
+
+    best_by_level() answers "highest DPS base usable at each level" for a
+    set of player attributes in one pass over the levels; on ties the
+    first base listed wins.
+    """
+
+    def __init__(self, items, max_level=DEFAULT_MAX_LEVEL):
+        self.items = tuple(items)
+        self.max_level = max_level
+        self.dps = [weapon_dps(info) for info in self.items]
+        self.required_level = [info.get("requiredLevel", 0) or 0 for info in self.items]
+        self.requirements = [[(info.get("requirements") or {}).get(stat, 0) or 0 for stat in STAT_KEYS]
+                             for info in self.items]
+
+    def _usable(self, stats):
+        """Per-base flags: the player's attributes meet the base's requirements"""
+        limits = [float("inf") if stats is None or stats.get(stat) is None else stats[stat] for stat in STAT_KEYS]
+        return [all(need <= limit for need, limit in zip(needs, limits)) for needs in self.requirements]
+
+    def best_by_level(self, stats=None):
+        """Index of the best usable base for each level 0..max_level (-1 where none is usable)"""
+        if not self.items:
+            return (-1,) * (self.max_level + 1)
+        usable = self._usable(stats)
+        # Bases become usable in required-level order, so the best one so far carries over to the next level
+        order = sorted((index for index in range(len(self.items)) if usable[index]),
+                       key=lambda index: self.required_level[index])
+        best, current, position = [], -1, 0
+        for level in range(self.max_level + 1):
+            while position < len(order) and self.required_level[order[position]] <= level:
+                index = order[position]
+                position += 1
+                if current < 0 or self.dps[index] > self.dps[current] or \
+                        (self.dps[index] == self.dps[current] and index < current):
+                    current = index
+            best.append(current)
+        return tuple(best)
+
+class WeaponScorer:
+    """DPS-ranked weapon picks per class, level and player attributes.
+
+    Score tables are built from the recommendation engine's item tables on
+    first use; each (class, attributes) level table is computed once and
+    cached, so lookups after that are an index.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or get_engine()
+        self._tables = {}
+        self._best = {}
+        self._lock = threading.Lock()
+
+    def table(self, category):
+        category = self.engine.aliases.get(category, category)
+        with self._lock:
+            if category not in self._tables:
+                item_table = self.engine.tables.get(category)
+                self._tables[category] = WeaponScoreTable(
+                    [record.info for record in item_table.records] if item_table else [],
+                    len(item_table.best_by_level) - 1 if item_table else DEFAULT_MAX_LEVEL)
+            return self._tables[category]
+
+    def best_by_level(self, category, stats=None):
+        table = self.table(category)
+        key = (self.engine.aliases.get(category, category),
+               tuple(None if not stats else stats.get(stat) for stat in STAT_KEYS))
+        with self._lock:
+            best = self._best.get(key)
+        if best is None:
+            best = table.best_by_level(stats)
+            with self._lock:
+                self._best[key] = best
+        return best
+
+    def best_for_level(self, category, level, stats=None):
+        """JSON entry of the highest-DPS base usable at level, or None"""
+        if level is None or level < 1:
+            return None
+        table = self.table(category)
+        best = self.best_by_level(category, stats)
+        index = best[min(int(level), len(best) - 1)]
+        return table.items[index] if index >= 0 else None
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+def get_weapon_scorer():
+    """Shared scorer, built on first use"""
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = WeaponScorer()
+    return _scorer
@@ -1,13 +1,12 @@
-import json
 import os
-from path_utils import get_data_file_path
+from path_utils import get_data_file_path, read_resource_json
+from weapon_scoring import get_weapon_scorer, weapon_dps
 
 def load_weapon_data():
     """Load weapon data from JSON file."""
     weapon_file = get_data_file_path('weapons.json')
     try:
-        with open(weapon_file, 'r') as f:
-            return json.load(f)
+        return read_resource_json(os.path.join('data', 'weapons.json'))
     except Exception as e:
         print(f"Error loading weapon data from {weapon_file}: {e}")
         return {"bows": [], "crossbows": [], "quarterstaves": [], "spears": [], "oneHandMaces": [], "twoHandMaces": []}
@@ -25,27 +24,13 @@ def get_weapon_type_key(weapon_type):
     }
     return type_mapping.get(weapon_type)
 
-def get_best_weapon_for_level(player_level, weapon_type):
-    """Get the best weapon available for the given player level and weapon type."""
-    if player_level is None or not weapon_type:
+def get_best_weapon_for_level(player_level, weapon_type, stats=None):
+    """Get the highest-DPS weapon usable at the given player level (and str/dex/int, if given)."""
+    if not weapon_type:
         return None
     
-    weapon_data = load_weapon_data()
-    weapon_key = get_weapon_type_key(weapon_type)
-    
-    if not weapon_key or weapon_key not in weapon_data:
-        return None
-    
-    weapons = weapon_data[weapon_key]
-    
-    # Find the best weapon that the player can use
-    available_weapons = [w for w in weapons if w["requiredLevel"] <= player_level]
-    
-    if not available_weapons:
-        return None
-    
-    # Return the weapon with the highest required level (best weapon available)
-    return max(available_weapons, key=lambda x: x["requiredLevel"])
+    # Weapon classes are categories in data/item_categories.json, ranked per level once and cached
+    return get_weapon_scorer().best_for_level(weapon_type, player_level, stats)
 
 def format_weapon_damage(weapon_info):
     """Format weapon damage for display."""
@@ -65,6 +50,7 @@ def format_weapon_damage(weapon_info):
 def format_weapon_stats(weapon_info):
     """Format weapon stats for display."""
     stats = []
+    stats.append(f"DPS: {weapon_dps(weapon_info):.1f}")
     stats.append(f"Crit: {weapon_info['criticalHitChance']}%")
     stats.append(f"APS: {weapon_info['attacksPerSecond']}")
     if "weaponRange" in weapon_info:
@@ -0,0 +1,136 @@
+import io
+import struct
+import time
+from path_utils import (get_resource_path, is_resource_dir, list_resource_dir,
+                        read_resource_bytes, read_resource_head, read_resource_text)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+NOTES_FILE = "notes.txt"
+
+def normalize_zone_name(zone_name):
+    """Key used to match log zone names against map folder names"""
+    return zone_name.strip().lower()
+
+def parse_zone_folder(folder_name):
+    """Split a zone folder like '2.5_Mud Burrow' into (2.5, 'Mud Burrow')"""
+    if '_' in folder_name:
+        prefix, name = folder_name.split('_', 1)
+        try:
+            return float(prefix), name
+        except ValueError:
+            return None, name
+    return None, folder_name
+
+def parse_act_folder(folder_name):
+    """Turn an act folder like 'act2' into 2 (None if it has no number)"""
+    digits = ''.join(c for c in folder_name if c.isdigit())
+    return int(digits) if digits else None
+
+def read_image_size(relative_path):
+    """Read a resource image's dimensions from its header without decoding pixels"""
+    header = read_resource_head(relative_path, 24)
+    if header.startswith(b'\x89PNG\r\n\x1a\n') and header[12:16] == b'IHDR':
+        return struct.unpack('>II', header[16:24])
+    # Other formats - let Pillow parse the header (it doesn't decode until asked)
+    from PIL import Image
+    with Image.open(io.BytesIO(read_resource_bytes(relative_path))) as image:
+        return image.size
+
+class ZoneManifest:
+    """Index of every zone folder under data/maps, built once.
+
+    Maps a normalized zone name to its act, campaign order, images (with
+    dimensions) and notes so zone changes never touch the filesystem.
+    """
+
+    def __init__(self, zones):
+        # Campaign order: by act, then by the folder's numeric prefix
+        self.ordered = sorted(zones, key=lambda z: (z['act'] or 0, z['order'] if z['order'] is not None else float('inf')))
+        self.zones = {}
+        for index, zone in enumerate(self.ordered):
+            zone['index'] = index
+            key = normalize_zone_name(zone['name'])
+            if key in self.zones:
+                print(f"Duplicate zone folder for '{zone['name']}' - using {self.zones[key]['directory']}")
+                continue
+            self.zones[key] = zone
+
+    @classmethod
+    def build(cls, maps_dir="data/maps"):
+        """Walk the maps resource directory once and build the manifest"""
+        start = time.perf_counter()
+        zones = []
+        if not is_resource_dir(maps_dir):
+            print(f"Maps directory not found: {get_resource_path(maps_dir)}")
+            return cls(zones)
+
+        for act_dir in sorted(list_resource_dir(maps_dir)):
+            act_path = f"{maps_dir}/{act_dir}"
+            if not is_resource_dir(act_path):
+                continue
+            for zone_dir in sorted(list_resource_dir(act_path)):
+                zone_path = f"{act_path}/{zone_dir}"
+                if is_resource_dir(zone_path):
+                    zones.append(cls._build_zone(act_dir, zone_dir, zone_path))
+
+        manifest = cls(zones)
+        print(f"Built zone manifest: {len(manifest.zones)} zones in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return manifest
+
+    @staticmethod
+    def _build_zone(act_dir, zone_dir, zone_path):
+        order, name = parse_zone_folder(zone_dir)
+        images = []
+        notes = ""
+        for file_name in sorted(list_resource_dir(zone_path)):
+            file_path = f"{zone_path}/{file_name}"
+            if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                try:
+                    width, height = read_image_size(file_path)
+                except Exception as e:
+                    print(f"Error reading image size for {file_path}: {e}")
+                    width, height = None, None
+                # Packed images are only extracted to this path when they're first decoded
+                images.append({'path': get_resource_path(file_path), 'width': width, 'height': height})
+            elif file_name == NOTES_FILE:
+                try:
+                    notes = read_resource_text(file_path).strip()
+                except Exception as e:
+                    print(f"Error reading notes: {e}")
+        return {
+            'name': name,
+            'act': parse_act_folder(act_dir),
+            'order': order,
+            'directory': get_resource_path(zone_path),
+            'images': images,
+            'notes': notes
+        }
+
+    def get(self, zone_name):
+        """Return the manifest entry for a zone name from the log, or None"""
+        if not zone_name:
+            return None
+        return self.zones.get(normalize_zone_name(zone_name))
+
+    def act_of(self, zone_name):
+        """Act number a zone belongs to, or None if it isn't in the manifest"""
+        entry = self.get(zone_name)
+        return entry['act'] if entry else None
+
+    def neighbors(self, zone_name, ahead=2, behind=1):
+        """Zones around zone_name in campaign order, nearest first.
+
+        Returns the next zone, then the previous one (for backtracking), then
+        the remaining zones further ahead.
+        """
+        zone = self.get(zone_name)
+        if zone is None:
+            return []
+        index = zone['index']
+        result = []
+        for offset in range(1, max(ahead, behind) + 1):
+            if offset <= ahead and index + offset < len(self.ordered):
+                result.append(self.ordered[index + offset])
+            if offset <= behind and index - offset >= 0:
+                result.append(self.ordered[index - offset])
+        return result